@@ -0,0 +1,9 @@
+# Shared fixtures of the tests: the example todolist next to this file
+import os
+import pytest
+
+from time_planner import inputYAML
+
+@pytest.fixture
+def tasks():
+    return inputYAML(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'todolist.yaml'))
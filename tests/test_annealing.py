@@ -0,0 +1,23 @@
+# Simulated annealing: the run stops within its time budget, before its max number of iterations
+import random
+import time
+
+import numpy as np
+import pytest
+
+from time_planner import input_analysis, reward_table, policy_random, policy_annealing, plan_rwd, Collector
+
+@pytest.mark.parametrize('time_budget', [0, 0.3])
+def test_annealing_time_budget(tasks, time_budget):
+    random.seed(0)
+    np.random.seed(0)
+    rwd_table = reward_table(tasks, input_analysis(tasks), tasks['today']['strictness'], 1)
+    plan = policy_random(tasks, 1, rwd_table)
+
+    collector = Collector()
+    time_start = time.time()
+    plan_new = policy_annealing(tasks, plan, 1, iterations = 10 ** 9, time_budget = time_budget, rwd_table = rwd_table, collector = collector)
+    assert time.time() - time_start < time_budget + 0.5
+    if time_budget == 0:
+        assert collector.counters['annealing_moves'] == 0
+    assert plan_rwd(plan_new) > 0
@@ -0,0 +1,41 @@
+# Bounded reward cache: LRU eviction, invalidation by task, and cached values equal to the uncached ones
+import pytest
+
+from time_planner import RewardCache, task_fingerprint, reward_discrete, reward_discrete_cached, reward_cache
+
+def test_lru_eviction():
+    cache = RewardCache(maxsize = 2)
+    assert cache.get('a', lambda: 1) == 1
+    assert cache.get('b', lambda: 2) == 2
+    assert cache.get('a', lambda: -1) == 1        # 'a' is now more recent than 'b'
+    assert cache.get('c', lambda: 3) == 3         # Evicts 'b'
+    assert set(cache.values) == {'a', 'c'}
+    assert cache.get('b', lambda: 4) == 4         # Computed again, evicts 'a'
+    assert set(cache.values) == {'c', 'b'}
+    assert cache.info() == {'hits': 1, 'misses': 4, 'size': 2, 'maxsize': 2}
+
+def test_invalidate(tasks):
+    cache = RewardCache()
+    task_names = [task_name for task_name in tasks if task_name not in ['today', 'sleeping']][:2]
+    for task_name in task_names:
+        for n in range(3):
+            cache.get(('reward_discrete', task_fingerprint(tasks[task_name]), float(n)), lambda: n)
+
+    cache.invalidate(tasks[task_names[0]])        # One task dict: only its values
+    assert len(cache.values) == 3
+    assert all(key[1] == task_fingerprint(tasks[task_names[1]]) for key in cache.values)
+
+    cache.invalidate({task_names[1]: tasks[task_names[1]]})       # Dict of tasks
+    assert len(cache.values) == 0
+
+    cache.get('a', lambda: 1)
+    cache.invalidate()
+    assert len(cache.values) == 0
+
+def test_cached_value(tasks):
+    task = tasks[[task_name for task_name in tasks if task_name not in ['today', 'sleeping']][0]]
+    reward_cache.invalidate(task)
+    for T in [1, 0.5]:
+        for n in range(4):
+            assert reward_discrete_cached(n, task, 0.5, T) == pytest.approx(reward_discrete(n, task, 0.5, T))
+            assert reward_discrete_cached(n, task, 0.5, T) == pytest.approx(reward_discrete(n, task, 0.5, T))
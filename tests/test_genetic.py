@@ -0,0 +1,35 @@
+# Genetic optimizer: repair keeps every individual within the capacity of every task, removing no more time slots than needed
+import random
+
+import numpy as np
+import pytest
+
+from time_planner import input_analysis, Plan, task_capacity, genetic_repair, policy_genetic, policy_traversal_all, plan_rwd
+
+@pytest.mark.parametrize('seed', range(3))
+def test_genetic_repair(seed):
+    np.random.seed(seed)
+    rng = np.random.default_rng(seed)
+    n_tasks, n_slots, population = 5, 24, 200
+    capacity_na = np.array([1, 2, 3, n_slots, 1, n_slots])
+    genes = rng.integers(-1, n_tasks, (population, n_slots))
+    awake = rng.random((4, n_slots)) < 0.7
+    choice = rng.integers(0, len(awake), population)
+
+    repaired = genetic_repair(genes, choice, awake, capacity_na)
+    assert np.all(repaired[~awake[choice]] == Plan.NA)
+    assert np.all((repaired == genes) | (repaired == Plan.NA))
+    for k in range(population):
+        for i in range(n_tasks):
+            count = np.sum(genes[k][awake[choice[k]]] == i)
+            assert np.sum(repaired[k] == i) == min(count, capacity_na[i])
+
+def test_genetic_capacity(tasks):
+    random.seed(0)
+    np.random.seed(0)
+    task_names = input_analysis(tasks)
+    plan = policy_genetic(tasks, 1, population = 64, generations = 50)
+    task = Plan.from_dict(plan, task_names, 1).task
+    counts = np.bincount(task[task >= 0], minlength = len(task_names))
+    assert all(counts[i] <= task_capacity(tasks[task_name], len(task), 1) for i, task_name in enumerate(task_names))
+    assert plan_rwd(plan) <= policy_traversal_all(tasks, 1)[1] + 1e-9
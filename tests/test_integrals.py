@@ -0,0 +1,36 @@
+# Closed-form slot integrals: the integral of each task type over [a, b] against a fine trapezoid of its contineous reward
+import os
+
+import numpy as np
+import pytest
+
+from time_planner import inputYAML, synthetic_todolist, reward_integral_array, reward_contineous_array
+
+# Tasks of each type, from the example todolist and a synthetic one, plus a necessity task with a time window
+def tasks_of_each_type():
+    todolist = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'todolist.yaml')
+    tasks = dict(synthetic_todolist(40, seed = 0), **inputYAML(todolist))
+    tasks['housekeeping_noon'] = dict(tasks['housekeeping'], name = 'housekeeping_noon', time = [11, 13])
+    tasks_by_type = {}
+    for task_name, task in tasks.items():
+        if task['type'] not in ['today', 'sleeping']:
+            tasks_by_type.setdefault(task['type'], []).append(task)
+    return tasks_by_type
+
+tasks_by_type = tasks_of_each_type()
+
+@pytest.mark.parametrize('task_type', sorted(tasks_by_type))
+def test_integral_trapezoid(task_type):
+    rng = np.random.default_rng(0)
+    for task in tasks_by_type[task_type]:
+        for strictness in [0, 0.5, 1]:
+            for k in range(10):
+                a = rng.uniform(0, 20)
+                b = a + rng.uniform(0, 4)
+                x = np.linspace(a, b, 20001)
+                y = reward_contineous_array(x, task, strictness)
+                expected = np.trapezoid(y, x)
+                # Off by at most half a step times each jump of the reward (e.g. at the start and end of fixed-time tasks)
+                tolerance = np.max(np.abs(y)) * (x[1] - x[0]) + 1e-9
+                integral = float(np.squeeze(reward_integral_array(np.array([a]), np.array([b]), task, strictness)))
+                assert integral == pytest.approx(expected, rel = 1e-6, abs = tolerance), (task['name'], strictness, a, b)
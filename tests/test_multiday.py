@@ -0,0 +1,54 @@
+# Multi-day planning: the days follow each other (time since now, day of the week, insisted days), and capacities hold over the days
+import numpy as np
+import pytest
+
+from time_planner import input_analysis, reward_table, reward_table_days, weekday, clock_offset, task_capacity, policy_multiday, \
+    policy_traversal_all, plan_rwd, Plan, rwd_fixed_ddl, rwd_asap
+
+def test_days_tables(tasks):
+    tasks['hw'] = dict(tasks['hw'], deadline = 60)       # Deadline on the 3rd day
+    task_names = input_analysis(tasks)
+    strictness = tasks['today']['strictness']
+    tables = reward_table_days(tasks, task_names, 4, strictness, 1)
+    # Day 0 is the table of one day, but for the last minute of the time since now (the table of one day wraps it at midnight)
+    same = [i for i, task_name in enumerate(task_names) if task_name not in ['hw', 'email']]
+    assert np.allclose(tables[0, same], reward_table(tasks, task_names, strictness, 1)[same])
+
+    # Time since now goes on over the days, with no wrap at midnight: per-minute average of the scalar reward on one timeline
+    offset = clock_offset('since_now', tasks['today']['curr_time'], 1)
+    for task_name, rwd in [('hw', rwd_fixed_ddl), ('email', rwd_asap)]:
+        row = [np.mean([rwd(x, tasks[task_name], strictness) for x in np.linspace(n - offset, n - offset + 1, 61)]) for n in range(4 * 24)]
+        assert np.allclose(tables[:, task_names.index(task_name)].reshape(-1), row, atol = 1e-9)
+
+    # Fixed-time task on the days of the week in its 'day' only, long-term task one more insisted day every day
+    i = task_names.index('lecture')
+    for d in range(4):
+        if weekday(tasks, d) in tasks['lecture']['day']:
+            assert np.allclose(tables[d, i], tables[0, i]) and np.any(tables[d, i] > 0)
+        else:
+            assert np.all(tables[d, i] == 0)
+    i = task_names.index('language')
+    for d in range(4):
+        tasks_day = dict(tasks, language = dict(tasks['language'], insist_day = tasks['language']['insist_day'] + d))
+        assert np.allclose(tables[d, i], reward_table(tasks_day, task_names, strictness, 1)[i])
+
+def test_multiday_capacity(tasks):
+    tasks['hw'] = dict(tasks['hw'], deadline = 60)
+    task_names = input_analysis(tasks)
+    plans, rwd = policy_multiday(tasks, 1, days = 3)
+    assert rwd == pytest.approx(sum(plan_rwd(plan) for plan in plans))
+
+    counts = []         # Time slots of each task on each day
+    for plan in plans:
+        task = Plan.from_dict(plan, task_names, 1).task
+        counts.append(np.bincount(task[task >= 0], minlength = len(task_names)))
+    counts = np.array(counts)
+    for i, task_name in enumerate(task_names):
+        if task_name in ['hw', 'email']:
+            assert counts[:, i].sum() <= task_capacity(tasks[task_name], 3 * 24, 1)      # Shared over all the days
+        else:
+            assert np.all(counts[:, i] <= task_capacity(tasks[task_name], 24, 1))
+
+# One day is the same problem as the traversal
+def test_multiday_one_day(tasks):
+    assert policy_multiday(tasks, 1, days = 1)[1] == pytest.approx(policy_traversal_all(tasks, 1)[1])
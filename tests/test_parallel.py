@@ -0,0 +1,7 @@
+# Parallel random traversal: each (bedtime, duration) job has its own seed, so the result does not depend on the number of workers
+from time_planner import plan_rwd, policy_random_traversal_parallel
+
+def test_parallel_workers(tasks):
+    plans = [policy_random_traversal_parallel(tasks, 1, horizon = 2, search_cycle = 3, workers = workers, seed = 7) for workers in [1, 2, 3]]
+    assert plans[0] == plans[1] == plans[2]
+    assert plan_rwd(plans[0]) > 0
@@ -0,0 +1,32 @@
+# Incremental scoring: the deltas of 'PlanScorer' are the change of a full re-score
+import random
+
+import pytest
+
+from time_planner import input_analysis, reward_table, policy_random, Plan, PlanScorer, plan_rwd
+
+def test_plan_scorer(tasks):
+    random.seed(0)
+    task_names = input_analysis(tasks)
+    rwd_table = reward_table(tasks, task_names, tasks['today']['strictness'], 1)
+    plan = Plan.from_dict(policy_random(tasks, 1, rwd_table), task_names, 1)
+    scorer = PlanScorer(plan, rwd_table)
+    awake_slots = list(plan.awake_slots())
+    assert scorer.total() == pytest.approx(plan_rwd(plan.to_dict(tasks)))
+
+    for k in range(200):
+        before = scorer.total()
+        if k % 2 == 0:
+            n = random.choice(awake_slots)
+            i = random.randrange(-1, len(task_names))
+            delta = scorer.delta_replace(n, i)
+            scorer.replace(n, i)
+        else:
+            n1, n2 = random.sample(awake_slots, 2)
+            delta = scorer.delta_swap(n1, n2)
+            scorer.swap(n1, n2)
+        total = scorer.total()
+        scorer.rescore()
+        assert scorer.total() == pytest.approx(total)
+        assert total - before == pytest.approx(delta)
+    assert scorer.total() == pytest.approx(plan_rwd(plan.to_dict(tasks)))
@@ -0,0 +1,25 @@
+# Portfolio of strategies: the returned plan stays within the capacity of every task, and its rwd is the rwd of that plan
+import numpy as np
+
+from time_planner import input_analysis, Plan, task_capacity, plan_rwd, policy_portfolio, policy_traversal_all
+
+def within_capacity(tasks, plan, T):
+    task_names = input_analysis(tasks)
+    plan = Plan.from_dict(plan, task_names, T)
+    counts = np.bincount(plan.task[plan.task >= 0], minlength = len(task_names))
+    return all(counts[i] <= task_capacity(tasks[task_name], len(plan.task), T) for i, task_name in enumerate(task_names))
+
+def test_portfolio_capacity(tasks):
+    tasks['sleeping'] = dict(tasks['sleeping'], bedtime_min = 20, bedtime_max = 23)
+    rwd_exact = policy_traversal_all(tasks, 0.5)[1]
+    for strategy in ['random_optimal', 'random_traversal', 'annealing']:
+        plan, rwd, strategy_max = policy_portfolio(tasks, 0.5, strategies = [strategy], restarts = 2, time_budget = 3, workers = 2)
+        assert within_capacity(tasks, plan, 0.5)
+        assert np.isclose(rwd, plan_rwd(plan))
+        assert rwd <= rwd_exact + 1e-9
+
+# A budget shorter than the start of the workers: the random fallback is sorted the same way
+def test_portfolio_fallback_capacity(tasks):
+    plan, rwd, strategy_max = policy_portfolio(tasks, 0.5, restarts = 1, time_budget = 0, workers = 1)
+    assert strategy_max == 'random'
+    assert within_capacity(tasks, plan, 0.5)
@@ -0,0 +1,40 @@
+# Task type registry: a type registered from outside the package is checked, tabled and planned like the built-in ones
+import numpy as np
+import pytest
+
+from time_planner import register_task_type, task_types, compile_fun, input_analysis, reward_table, policy_traversal_all, Plan
+
+# 'morning' tasks: full reward before 12:00 and none after, once every day; no closed-form integral (quadrature of the kernel)
+@pytest.fixture
+def morning():
+    register_task_type('test_morning', {'enjoyment', 'productivity'}, compile_fun, lambda x, params: np.where(x < 12, params['reward'], 0.),
+                       disposable = True)
+    yield {'name': 'jogging', 'type': 'test_morning', 'enjoyment': 6, 'productivity': 4}
+    task_types.pop('test_morning')
+
+def test_custom_reward_table(tasks, morning):
+    tasks['jogging'] = morning
+    task_names = input_analysis(tasks)
+    strictness = tasks['today']['strictness']
+    reward = 6 * (1 - strictness) + 4 * strictness
+    row = np.where(np.arange(24) < 12, reward, 0.)
+    row[11] = reward * 60 / 61     # Per-minute average over 61 points: 12:00 itself is not before 12:00,
+    row[23] = reward / 61          # and 24:00 is 0:00 of the day
+    i = task_names.index('jogging')
+    assert np.allclose(reward_table(tasks, task_names, strictness, 1)[i], row)
+    assert np.allclose(reward_table(tasks, task_names, strictness, 1, detailed = 'exact')[i], np.where(np.arange(24) < 12, reward, 0.), atol = 1e-6)
+
+    plan, rwd = policy_traversal_all(tasks, 1)
+    task = Plan.from_dict(plan, task_names, 1).task
+    assert np.sum(task == i) == 1 and np.flatnonzero(task == i)[0] < 12
+
+def test_custom_params(tasks, morning):
+    tasks['jogging'] = dict(morning)
+    del tasks['jogging']['productivity']
+    with pytest.raises(Exception):
+        input_analysis(tasks)
+
+def test_unregistered(tasks):
+    tasks['jogging'] = {'name': 'jogging', 'type': 'test_morning', 'enjoyment': 6, 'productivity': 4}
+    with pytest.raises(Exception):
+        reward_table(tasks, input_analysis(tasks), 0.5, 1)
@@ -0,0 +1,48 @@
+# Re-planning: the time slots before 'now' are kept as they are, and only the future is planned again
+import random
+
+import numpy as np
+import pytest
+
+from time_planner import input_analysis, Plan, plan_rwd, policy_random, policy_sort_disposable, policy_replan, policy_traversal_all
+
+def slots(plan, task_names):
+    plan = Plan.from_dict(plan, task_names, 1)
+    return plan.task, plan.rwd
+
+@pytest.mark.parametrize('now', [0, 9.5, 15])
+def test_replan_keeps_past(tasks, now):
+    random.seed(0)
+    np.random.seed(0)
+    task_names = input_analysis(tasks)
+    plan = policy_sort_disposable(tasks, policy_random(tasks, 1), 1)
+    plan_new, rwd = policy_replan(tasks, plan, 1, now = now)
+    assert rwd == pytest.approx(plan_rwd(plan_new))
+    assert rwd >= plan_rwd(plan) - 1e-9         # The previous plan is one of the candidates
+
+    past = int(np.ceil(now))
+    task, rwd_slots = slots(plan, task_names)
+    task_new, rwd_slots_new = slots(plan_new, task_names)
+    assert np.array_equal(task_new[:past], task[:past])
+    awake = task[:past] != Plan.SLEEPING           # A sleep still going on at 'now' may end at another time, with another rwd
+    assert np.allclose(rwd_slots_new[:past][awake], rwd_slots[:past][awake])
+    if now == 0:
+        assert rwd == pytest.approx(policy_traversal_all(tasks, 1)[1])
+
+# A task removed from the todolist stays in the past time slots only, a new task can only take future time slots
+def test_replan_todolist_change(tasks):
+    plan = policy_traversal_all(tasks, 1)[0]
+    task_names = input_analysis(tasks)
+    task = slots(plan, task_names)[0]
+    i_removed = next(i for i in task if i >= 0)
+    removed = task_names[i_removed]
+    now = np.flatnonzero(task == i_removed)[0] + 1
+
+    tasks_new = {task_name: tasks[task_name] for task_name in tasks if task_name != removed}
+    tasks_new['piano'] = {'name': 'piano', 'type': 'fun', 'enjoyment': 9, 'productivity': 9}
+    plan_new, rwd = policy_replan(tasks_new, plan, 1, now = now)
+    names = input_analysis(tasks_new) + [removed]
+    task_new = slots(plan_new, names)[0]
+    assert np.array_equal(task_new[:now], Plan.from_dict(plan, names, 1).task[:now])
+    assert not np.any(task_new[now:] == names.index(removed))
+    assert np.any(task_new[now:] == names.index('piano'))
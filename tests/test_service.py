@@ -0,0 +1,45 @@
+# Planning service: plans over HTTP from the warm todolist, and backpressure (503) when too many requests are pending
+import asyncio
+
+import pytest
+
+from time_planner import PlanningService, service_request
+
+def run_service(check, **params):
+    async def main():
+        service = PlanningService(1, **params)
+        server = await service.start(port = 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await check(service, port)
+        finally:
+            server.close()
+            await server.wait_closed()
+            service.close()
+    return asyncio.run(main())
+
+def test_service_plan(tasks):
+    async def check(service, port):
+        status, content = await service_request('POST', '/plan', {'id': 'example', 'tasks': tasks}, port = port)
+        assert status == 200
+        status_replan, content_replan = await service_request('POST', '/replan', {'id': 'example', 'now': 15}, port = port)
+        assert status_replan == 200
+        assert (await service_request('POST', '/replan', {'id': 'unknown'}, port = port))[0] == 404
+        return content['rwd'], content_replan['rwd'], (await service_request('GET', '/stats', port = port))[1]
+    rwd, rwd_replan, stats = run_service(check, workers = 1)
+    assert rwd == pytest.approx(154.45386186115599)
+    assert rwd_replan == pytest.approx(rwd)         # Same todolist: the rest of the day stays optimal
+    assert stats['counters']['completed'] == 2
+    assert stats['workers'] == 1
+
+def test_service_backpressure(tasks):
+    async def check(service, port):
+        await service_request('POST', '/todolist', {'id': 'example', 'tasks': tasks}, port = port)
+        body = {'id': 'example', 'policy': 'annealing', 'iterations': 10 ** 7, 'budget': 2}
+        first = asyncio.ensure_future(service_request('POST', '/plan', body, port = port))
+        while service.queued + service.running == 0:
+            await asyncio.sleep(0.01)
+        status, content = await service_request('POST', '/plan', body, port = port)
+        await first
+        return status, service.counters['rejected']
+    assert run_service(check, workers = 1, max_pending = 1) == (503, 1)
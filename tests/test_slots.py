@@ -0,0 +1,33 @@
+# Sleeping choice grid: the same choices, rwd and awake time slots as the scalar path, for bedtime ranges across 0:00 or not
+import numpy as np
+import pytest
+
+from time_planner import input_analysis, reward_table, sleeping_choices, sleeping_plan, SleepGrid, rwd_sleeping
+
+@pytest.mark.parametrize('bedtime_min, bedtime_max, bedtime_list', [(22, 4, list(range(-2, 5))), (20, 23, [20, 21, 22, 23]), (1, 4, [1, 2, 3, 4])])
+def test_sleeping_choices(tasks, bedtime_min, bedtime_max, bedtime_list):
+    sleeping = dict(tasks['sleeping'], bedtime_min = bedtime_min, bedtime_max = bedtime_max)
+    assert sleeping_choices(sleeping, 1)[0].tolist() == bedtime_list
+    assert sleeping_choices(sleeping, 0.5)[0].tolist() == list(np.arange(bedtime_list[0], bedtime_list[-1] + 0.25, 0.5))
+    assert sleeping_choices(sleeping, 0.25, step = 0.5)[0].tolist() == sleeping_choices(sleeping, 0.5)[0].tolist()
+
+@pytest.mark.parametrize('bedtime_min, bedtime_max', [(22, 4), (20, 23), (1, 4)])
+@pytest.mark.parametrize('T, step', [(1, None), (0.5, None), (0.25, 1)])
+def test_sleep_grid(tasks, bedtime_min, bedtime_max, T, step):
+    tasks['sleeping'] = dict(tasks['sleeping'], bedtime_min = bedtime_min, bedtime_max = bedtime_max)
+    strictness = tasks['today']['strictness']
+    grid = SleepGrid(tasks['sleeping'], strictness, T, step = step)
+    rwd_table = reward_table(tasks, input_analysis(tasks), strictness, T)
+    slot_max = np.maximum(np.max(rwd_table, axis = 0), 0)
+    bounds = grid.bounds(rwd_table)
+
+    for bedtime, duration in grid.choices():
+        plan, time_list = sleeping_plan(tasks, bedtime, duration, strictness, T)
+        rwd = rwd_sleeping(0, np.mod(bedtime, 24), duration, tasks['sleeping'], strictness, T)
+        assert grid.reward(bedtime, duration) == pytest.approx(rwd)
+        assert grid.reward(np.mod(bedtime, 24), duration) == pytest.approx(rwd)       # Bedtime as the time of the day
+        assert grid.time_list(bedtime, duration) == time_list
+        assert grid.layout(bedtime, duration)[1] == time_list
+        assert len(time_list) + sum(len(task['rwd']) for task in plan.values()) == int(round(24 / T))
+        i, j = grid.index(bedtime, duration)
+        assert bounds[i, j] == pytest.approx(rwd * np.sum(slot_max[time_list]))
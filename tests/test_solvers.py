@@ -0,0 +1,66 @@
+# Exact solvers: the assignment of the time slots agrees with brute force on small instances
+import itertools
+
+import numpy as np
+import pytest
+
+from time_planner import assignment_dp, assignment_lsa, policy_traversal_all, synthetic_todolist, plan_rwd
+
+# Max total reward over all the assignments of the time slots (task or N/A) within the capacities
+def brute_force(rwd_table, time_list, capacity):
+    best = 0.
+    for assignment in itertools.product(range(-1, rwd_table.shape[0]), repeat = len(time_list)):
+        count = np.bincount([i for i in assignment if i >= 0], minlength = rwd_table.shape[0])
+        if np.all(count <= capacity):
+            best = max(best, sum(rwd_table[i, n] for i, n in zip(assignment, time_list) if i >= 0))
+    return best
+
+def assignment_reward(rwd_table, assignment):
+    return sum(rwd_table[i, n] for n, i in assignment.items() if i >= 0)
+
+def check_assignment(solve, seed):
+    rng = np.random.default_rng(seed)
+    rwd_table = rng.normal(1, 1, (3, 8))        # Some negative rewards: N/A is better there
+    time_list = [0, 2, 3, 5, 6, 7]
+    capacity = np.array([1, 2, 8])
+    expected = brute_force(rwd_table, time_list, capacity)
+    reward, assignment = solve(rwd_table, time_list, capacity)
+    assert reward == pytest.approx(expected)
+    assert assignment_reward(rwd_table, assignment) == pytest.approx(expected)
+    assert sorted(assignment) == time_list
+    assert np.all(np.bincount([i for i in assignment.values() if i >= 0], minlength = 3) <= capacity)
+
+@pytest.mark.parametrize('seed', range(5))
+def test_dp_brute_force(seed):
+    check_assignment(assignment_dp, seed)
+
+@pytest.mark.parametrize('seed', range(5))
+def test_lsa_brute_force(seed):
+    check_assignment(assignment_lsa, seed)
+
+# Above the state bound, 'assignment_dp' falls back to 'assignment_lsa' instead of allocating the dense table
+def test_dp_state_bound():
+    rng = np.random.default_rng(0)
+    rwd_table = rng.random((30, 24))
+    capacity = np.full(30, 2)
+    reward, assignment = assignment_dp(rwd_table, range(24), capacity)
+    assert reward == pytest.approx(assignment_lsa(rwd_table, range(24), capacity)[0])
+    assert assignment_dp(rwd_table[:4], range(24), capacity[:4], max_states = 1)[0] == pytest.approx(assignment_dp(rwd_table[:4], range(24), capacity[:4])[0])
+
+# The rwd of the traversal is the rwd of its plan
+@pytest.mark.parametrize('seed', range(3))
+def test_traversal_dp(seed):
+    tasks = synthetic_todolist(6, seed = seed)
+    plan, rwd = policy_traversal_all(tasks, 1, solver = 'dp')
+    assert plan_rwd(plan) == pytest.approx(rwd)
+
+def test_traversal_solvers(tasks):
+    plan_dp, rwd_dp = policy_traversal_all(tasks, 1, solver = 'dp')
+    plan_lsa, rwd_lsa = policy_traversal_all(tasks, 1)
+    assert rwd_dp == pytest.approx(rwd_lsa)
+    assert plan_rwd(plan_lsa) == pytest.approx(rwd_lsa)
+
+@pytest.mark.parametrize('seed', range(3))
+def test_traversal_solvers_synthetic(seed):
+    tasks = synthetic_todolist(6, seed = seed)
+    assert policy_traversal_all(tasks, 1, solver = 'dp')[1] == pytest.approx(policy_traversal_all(tasks, 1, solver = 'assignment')[1])
@@ -0,0 +1,35 @@
+# On-disk cache: reward tables and best plans come back as they were saved
+import numpy as np
+import pytest
+
+from time_planner import input_analysis, reward_table, policy_traversal_all, PlanStore, todolist_hash, policy_traversal_stored
+
+def test_store_reward_table(tasks, tmp_path):
+    store = PlanStore(str(tmp_path))
+    task_names = input_analysis(tasks)
+    strictness = tasks['today']['strictness']
+    expected = reward_table(tasks, task_names, strictness, 1)
+    assert np.array_equal(store.reward_table(tasks, task_names, strictness, 1), expected)
+    assert np.array_equal(PlanStore(str(tmp_path)).reward_table(tasks, task_names, strictness, 1), expected)      # Read back from the file
+
+def test_store_plan(tasks, tmp_path):
+    store = PlanStore(str(tmp_path))
+    key = todolist_hash(tasks, 1, kind = 'test')
+    assert store.load_plan(key) == (None, -np.inf)
+    plan, rwd = policy_traversal_all(tasks, 1)
+    assert store.save_plan(key, plan, rwd)
+    assert not store.save_plan(key, plan, rwd - 1)          # Only a better plan replaces the stored one
+    plan_loaded, rwd_loaded = PlanStore(str(tmp_path)).load_plan(key)
+    assert rwd_loaded == pytest.approx(rwd)
+    assert list(plan_loaded) == list(plan)
+    for name in plan:
+        assert plan_loaded[name]['name'] == plan[name]['name']
+        assert np.allclose(plan_loaded[name]['time'], plan[name]['time'])
+        assert np.allclose(plan_loaded[name]['rwd'], plan[name]['rwd'])
+
+def test_traversal_stored(tasks, tmp_path):
+    store = PlanStore(str(tmp_path))
+    plan, rwd = policy_traversal_stored(tasks, store, 1)
+    assert policy_traversal_stored(tasks, store, 1)[1] == pytest.approx(rwd)
+    store.clear()
+    assert store.load_plan(todolist_hash(tasks, 1, kind = 'policy_traversal_all'))[0] is None
@@ -0,0 +1,35 @@
+# Strictness sweep: tables blended from enjoyment and productivity equal the tables built at each strictness, and the frontier is non-dominated
+import numpy as np
+import pytest
+
+from time_planner import input_analysis, reward_table, reward_table_strictness, synthetic_todolist, pareto_frontier, \
+    policy_strictness_sweep, policy_traversal_all
+
+strictness_list = [0, 0.25, 0.6, 1]
+
+@pytest.mark.parametrize('seed', [None, 0, 1])
+def test_blended_tables(tasks, seed):
+    if seed is not None:
+        tasks = synthetic_todolist(12, seed = seed)     # All the task types, including the non-linear ones in strictness
+    task_names = input_analysis(tasks)
+    for strictness, rwd_table in zip(strictness_list, reward_table_strictness(tasks, task_names, strictness_list, 0.5)):
+        assert np.allclose(rwd_table, reward_table(tasks, task_names, strictness, 0.5), atol = 1e-9)
+
+# Points not dominated by any other point (at least as good in both objectives, better in one)
+def non_dominated(points):
+    return [k for k, p in enumerate(points)
+            if not any(q[0] >= p[0] and q[1] >= p[1] and (q[0] > p[0] or q[1] > p[1]) for q in points)]
+
+@pytest.mark.parametrize('seed', range(5))
+def test_pareto_frontier(seed):
+    points = [tuple(p) for p in np.random.default_rng(seed).random((30, 2))]
+    frontier = pareto_frontier(points)
+    assert sorted(frontier) == non_dominated(points)
+    assert [points[k][0] for k in frontier] == sorted(points[k][0] for k in frontier)
+
+def test_strictness_sweep(tasks):
+    plans, rwds, objectives, frontier = policy_strictness_sweep(tasks, 1, strictness_list = strictness_list)
+    for strictness, rwd in zip(strictness_list, rwds):
+        tasks['today']['strictness'] = strictness
+        assert rwd == pytest.approx(policy_traversal_all(tasks, 1)[1])
+    assert set(frontier) == set(non_dominated(objectives))
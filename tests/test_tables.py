@@ -0,0 +1,42 @@
+# Reward tables against the legacy scalar reward functions 'rwd_*', averaged over each time slot as the planner did before the tables
+import numpy as np
+import pytest
+
+from time_planner import input_analysis, reward_table, task_type_of, clock_offset, synthetic_todolist, \
+    rwd_fixed_time, rwd_fixed_ddl, rwd_asap, rwd_fun, rwd_long_term, rwd_necessity, rwd_meal
+
+legacy_rwd = {'fixed_time': rwd_fixed_time, 'fixed_ddl': rwd_fixed_ddl, 'as_soon_as_possible': rwd_asap, 'fun': rwd_fun,
+              'long_term': rwd_long_term, 'necessity': rwd_necessity, 'meal': rwd_meal}
+
+# Average of the scalar reward over [n * T, (n + 1) * T]: each minute if detailed, else the two ends
+def legacy_discrete(n, task, strictness, detailed, T):
+    count = int(np.floor(T * 60 + 1)) if detailed else 2
+    return sum(legacy_rwd[task['type']](np.mod(x, 24), task, strictness) for x in np.linspace(n * T, (n + 1) * T, count)) / count
+
+def legacy_table(tasks, task_names, strictness, detailed, T):
+    n_slots = int(round(24 / T))
+    table = np.zeros((len(task_names), n_slots))
+    for i, task_name in enumerate(task_names):
+        task = tasks[task_name]
+        clock = task_type_of(task).clock
+        for n in range(n_slots):
+            if clock == 'duration':
+                table[i, n] = legacy_discrete(T, task, strictness, detailed, T)
+            else:
+                table[i, n] = legacy_discrete(n - clock_offset(clock, tasks['today']['curr_time'], T), task, strictness, detailed, T)
+    return table
+
+@pytest.mark.parametrize('T', [1, 0.5])
+def test_reward_table_example(tasks, T):
+    task_names = input_analysis(tasks)
+    strictness = tasks['today']['strictness']
+    assert np.allclose(reward_table(tasks, task_names, strictness, T), legacy_table(tasks, task_names, strictness, True, T), atol = 1e-9)
+
+# All the task types, with the planner started before midnight (time slots shifted for the 'since_now' types)
+@pytest.mark.parametrize('seed, curr_time, detailed', [(0, 24, True), (1, 20, True), (2, 24, False), (3, 21, False)])
+def test_reward_table_synthetic(seed, curr_time, detailed):
+    tasks = synthetic_todolist(12, seed = seed)
+    tasks['today']['curr_time'] = curr_time
+    task_names = input_analysis(tasks)
+    table = reward_table(tasks, task_names, 0.5, 0.5, detailed = detailed)
+    assert np.allclose(table, legacy_table(tasks, task_names, 0.5, detailed, 0.5), atol = 1e-9)
@@ -0,0 +1,24 @@
+# Random traversal of the sleeping choices: the plans stay within the capacity of every task and below the exact optimum
+import random
+import numpy as np
+import pytest
+
+from time_planner import input_analysis, Plan, task_capacity, plan_rwd, policy_random_traversal, policy_traversal_all
+
+def within_capacity(tasks, plan, T):
+    task_names = input_analysis(tasks)
+    plan = Plan.from_dict(plan, task_names, T)
+    counts = np.bincount(plan.task[plan.task >= 0], minlength = len(task_names))
+    return all(counts[i] <= task_capacity(tasks[task_name], len(plan.task), T) for i, task_name in enumerate(task_names))
+
+# Pruning compares the bound of each sleeping choice with the incumbent, so a plan over capacity would prune the optimum away
+@pytest.mark.parametrize('bedtime_min, bedtime_max', [(20, 23), (1, 4)])
+def test_random_traversal_prune(tasks, bedtime_min, bedtime_max):
+    tasks['sleeping'] = dict(tasks['sleeping'], bedtime_min = bedtime_min, bedtime_max = bedtime_max)
+    rwd_exact = policy_traversal_all(tasks, 0.5)[1]
+    for seed in range(2):
+        random.seed(seed)
+        np.random.seed(seed)
+        plan = policy_random_traversal(tasks, 0.5, prune = True)
+        assert within_capacity(tasks, plan, 0.5)
+        assert plan_rwd(plan) <= rwd_exact + 1e-9
@@ -0,0 +1,45 @@
+#coding: UTF-8
+'''
+=================== License Information ===================
+Author:     June Hu
+Email:      junesirius@ucla.edu
+Version:    Ver 3.0.0
+Date:       February 10, 2020
+'''
+
+# Time planner package: importing it does no work and only loads numpy;
+# yaml, scipy.optimize and matplotlib are imported by the functions that need them
+
+from .config import T, procrastination
+from .inputs import inputYAML, input_analysis
+from .rewards import rwd_after_strict, rwd_fixed_time, func_fixed_ddl, findfunc_fixed_ddl, rwd_fixed_ddl, func_asap, \
+    findfunc_asap, rwd_asap, rwd_fun, func_long_term_duration, func_long_term_insist_days, rwd_long_term, \
+    findfunc_necessity, func_necessity, rwd_necessity, logisticSigmoid, func_meal, rwd_meal, func_sleeping_duration, \
+    func_sleeping_bedtime, func_sleeping_cycle, rwd_sleeping, compile_fixed_time, kernel_fixed_time, \
+    integral_fixed_time, compile_fixed_ddl, kernel_fixed_ddl, integral_fixed_ddl, compile_asap, kernel_asap, \
+    integral_asap, compile_fun, kernel_fun, integral_fun, compile_long_term, kernel_long_term, integral_long_term, \
+    day_long_term, compile_necessity, kernel_necessity, integral_necessity, compile_meal, kernel_meal, day_fixed_time, \
+    capacity_approx_time, reward_contineous, reward_discrete, reward_contineous_array, quadrature_nodes, \
+    kernel_integral, reward_integral_array, reward_discrete_array
+from .cache import task_fingerprint, RewardCache, reward_cache, reward_discrete_cached, rwd_sleeping_cached
+from .slots import slot_floor, slot_ceil, sleeping_choices, sleeping_layout, sleeping_plan, SleepGrid, sleep_grid, \
+    task_capacity
+from .tables import clock_offset, rwd_discrete_modify, task_row, reward_table, stack_tasks, reward_table_batch, \
+    reward_table_strictness, weekday, reward_table_days
+from .instrument import Collector, timed, instrumented
+from .plan import Plan, PlanScorer, plan_rwd, plan_order, plan_sort
+from .solvers import plan_from_assignment, assignment_baseline, dp_max_states, assignment_dp, assignment_lsa
+from .policies import disposable_tasks, task_limits, policy_random, policy_random_modify, policy_random_given_sleeping, \
+    random_replacement, policy_random_optimal, policy_sort_disposable, policy_random_optimal_disposal, \
+    policy_annealing, traversal_choices, report_pruned, policy_random_traversal, traversal_job, \
+    policy_random_traversal_parallel, policy_traversal_all, traversal_exact, traversal_best, policy_batch, \
+    plan_objectives, pareto_frontier, policy_strictness_sweep, policy_multiday, policy_replan
+from .visualize import line_colors, plan_slot_length, plan_lines, visualize_plan, render_job, render_plans, plan_svg, \
+    plans_html
+from .benchmark import synthetic_todolist, benchmark_func, benchmark
+from .store import todolist_hash, PlanStore, policy_traversal_stored
+from .service import PlanningService, serve, service_request, service_job
+from .portfolio import portfolio_strategies, portfolio_init, incumbent_update, portfolio_score, portfolio_job, \
+    policy_portfolio
+from .genetic import genetic_fitness, genetic_repair, policy_genetic
+from .registry import clocks, TaskType, task_types, register_task_type, task_type_of
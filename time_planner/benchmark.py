@@ -0,0 +1,163 @@
+# Headless benchmark of the reward functions, the policies and the plan utilities over synthetic todolists
+import copy
+import io
+import json
+import platform
+import random
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+import numpy as np
+
+from .inputs import input_analysis
+from .rewards import rwd_fixed_time, rwd_fixed_ddl, rwd_asap, rwd_fun, rwd_long_term, rwd_necessity, rwd_meal, rwd_sleeping, reward_discrete
+from .cache import reward_cache
+from .slots import sleeping_choices
+from .tables import reward_table
+from .plan import plan_rwd, plan_order, plan_sort
+from .policies import policy_random, policy_random_modify, policy_random_given_sleeping, policy_random_optimal, policy_sort_disposable, \
+    policy_random_optimal_disposal, policy_annealing, policy_random_traversal, policy_random_traversal_parallel, policy_traversal_all, policy_batch, \
+    policy_strictness_sweep, policy_multiday, policy_replan
+
+# Synthetic todolist in the same format as from 'inputYAML', for benchmarks
+def synthetic_todolist(n_tasks = 20, mix = None, seed = 0):
+    # Given:
+    #     n_tasks: number of tasks, besides 'today' and 'sleeping'
+    #     mix: dict of {task type: weight} of the task types to draw from, default: all the task types with the same weight
+    #     seed: random seed, the same todolist for the same seed
+    # Return: dict of tasks, valid for 'input_analysis'
+    rng = random.Random(seed)
+    if mix is None:
+        mix = {task_type: 1 for task_type in ['fixed_time', 'fixed_ddl', 'as_soon_as_possible', 'fun', 'long_term', 'necessity', 'meal']}
+    task_types = list(mix.keys())
+    weights = [mix[task_type] for task_type in task_types]
+
+    def rating():
+        return round(rng.uniform(0, 10), 1)
+
+    tasks = {'today': {'name': 'today', 'type': 'today', 'curr_time': 24, 'day': rng.randint(1, 7), 'strictness': 0.5},
+             'sleeping': {'name': 'sleeping', 'type': 'sleeping', 'duration_min': 5, 'duration_max': 12, 'bedtime_min': 22, 'bedtime_max': 4,
+                          'enjoyment': 6, 'productivity': 2}}
+    for k in range(n_tasks):
+        task_type = rng.choices(task_types, weights)[0]
+        task_name = task_type + '_' + str(k)
+        task = {'name': task_name, 'type': task_type, 'enjoyment': rating(), 'productivity': rating()}
+        if task_type == 'fixed_time':
+            task.update({'day': sorted(rng.sample(range(1, 8), rng.randint(1, 3))), 'start': rng.randint(8, 20), 'duration': rng.choice([1, 1.5, 2, 3]), 'switch': 0.25})
+        elif task_type == 'fixed_ddl':
+            task.update({'approx_time': rng.choice([1, 2, 3, 4]), 'deadline': rng.choice([12, 24, 36, 48]), 'switch': 0.1})
+        elif task_type == 'as_soon_as_possible':
+            task.update({'approx_time': rng.choice([0.5, 1, 2]), 'switch': 0.2})
+        elif task_type == 'long_term':
+            task.update({'insist_day': rng.randint(0, 10), 'duration_max': rng.choice([0.5, 1, 1.5, 2])})
+        elif task_type == 'necessity':
+            start = rng.randint(7, 20)
+            task.update({'time': rng.choice([[], [start], [start, start + 2]]), 'duration': rng.choice([0.5, 1])})
+        elif task_type == 'meal':
+            start = rng.randint(7, 18)
+            task.update({'time': [start, start + 3], 'duration': rng.choice([0.33, 0.5, 1])})
+        tasks[task_name] = task
+    return tasks
+
+# Time 'repeat' calls of func(*setup()) (setup is not timed), and the peak memory of one more call traced by 'tracemalloc'
+def benchmark_func(name, func, setup, repeat = 3, **info):
+    # Return: dict of the results, with the extra 'info' (e.g. the size of the todolist)
+    seconds = 0
+    for k in range(repeat):
+        args = setup()
+        with redirect_stdout(io.StringIO()):       # Policies print their progress
+            start = time.perf_counter()
+            func(*args)
+            seconds += time.perf_counter() - start
+
+    args = setup()
+    tracemalloc.start()
+    with redirect_stdout(io.StringIO()):
+        func(*args)
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    result = {'name': name, 'calls': repeat, 'seconds': seconds, 'per_call': seconds / repeat, 'throughput': repeat / seconds if seconds > 0 else None, \
+              'peak_memory': peak_memory}
+    result.update(info)
+    return result
+
+# Headless benchmark of the reward functions, the policies and the plan utilities over synthetic todolists, results saved as JSON
+def benchmark(T, sizes = None, mix = None, repeat = 3, output = 'benchmark.json', seed = 0, heavy = False):
+    # Given:
+    #     T: time slot length
+    #     sizes: numbers of tasks of the synthetic todolists, default: 10 and 30
+    #     mix: task type mix, same as in 'synthetic_todolist'
+    #     repeat: number of timed calls of each function
+    #     output: JSON file name, None for not saving
+    #     heavy: also benchmark the random traversals (one optimization for every sleeping choice)
+    # Return: dict of {'meta': environment info, 'results': list of the results of 'benchmark_func'}
+    if sizes is None:
+        sizes = [10, 30]
+    results = []
+    for size in sizes:
+        tasks = synthetic_todolist(size, mix, seed)
+        task_names = input_analysis(tasks)
+        strictness = tasks['today']['strictness']
+        sleeping = tasks['sleeping']
+        rwd_table = reward_table(tasks, task_names, strictness, T = T)
+        random.seed(seed)
+        np.random.seed(seed)
+        with redirect_stdout(io.StringIO()):
+            plan_random = policy_random(tasks, T, rwd_table = rwd_table)
+            plan_exact, rwd_max = policy_traversal_all(tasks, T, rwd_table = rwd_table, solver = 'assignment')
+        bedtime_list, duration_list = sleeping_choices(sleeping, T)
+        info = {'size': size, 'T': T}
+
+        # Reward functions: one call for every task of the type over the time points of a day
+        x_list = np.arange(0, 24, T)
+        for task_type, func in [('fixed_time', rwd_fixed_time), ('fixed_ddl', rwd_fixed_ddl), ('as_soon_as_possible', rwd_asap), ('fun', rwd_fun), \
+                                ('long_term', rwd_long_term), ('necessity', rwd_necessity), ('meal', rwd_meal)]:
+            typed = [tasks[task_name] for task_name in task_names if tasks[task_name]['type'] == task_type]
+            if typed:
+                results.append(benchmark_func(func.__name__, lambda typed = typed, func = func: [func(x, task, strictness) for task in typed for x in x_list], \
+                                              lambda: (), repeat, count = len(typed) * len(x_list), **info))
+        results.append(benchmark_func('rwd_sleeping', lambda: [rwd_sleeping(0, b, d, sleeping, strictness, T) for b in bedtime_list for d in duration_list], \
+                                      lambda: (), repeat, count = len(bedtime_list) * len(duration_list), **info))
+        results.append(benchmark_func('reward_discrete', lambda: [reward_discrete(n, tasks[task_name], strictness, T = T) for task_name in task_names for n in range(len(x_list))], \
+                                      lambda: (), repeat, count = len(task_names) * len(x_list), **info))
+
+        # Reward table, cold (cache cleared before each call) and warm
+        results.append(benchmark_func('reward_table_cold', reward_table, lambda: (reward_cache.invalidate(), (tasks, task_names, strictness, T, True))[1], repeat, **info))
+        results.append(benchmark_func('reward_table_warm', reward_table, lambda: (tasks, task_names, strictness, T, True), repeat, **info))
+
+        # Policies, with the same reward table; the random state is reset before each call
+        def seeded(*args):
+            random.seed(seed)
+            np.random.seed(seed)
+            return args
+        policies = [('policy_random', policy_random, lambda: seeded(tasks, T, rwd_table)),
+                    ('policy_random_modify', policy_random_modify, lambda: seeded(tasks, T, rwd_table)),
+                    ('policy_random_given_sleeping', policy_random_given_sleeping, lambda: seeded(tasks, bedtime_list[0], duration_list[-1], T, rwd_table)),
+                    ('policy_random_optimal', policy_random_optimal, lambda: seeded(tasks, plan_random, T, 5, 7, rwd_table)),
+                    ('policy_sort_disposable', policy_sort_disposable, lambda: seeded(tasks, plan_random, T)),
+                    ('policy_random_optimal_disposal', policy_random_optimal_disposal, lambda: seeded(tasks, plan_random, T, 5, 7, rwd_table)),
+                    ('policy_annealing', policy_annealing, lambda: seeded(tasks, plan_random, T, 20000, None, 1, 'exponential', rwd_table)),
+                    ('policy_traversal_all', policy_traversal_all, lambda: seeded(tasks, T, rwd_table, 'assignment')),
+                    ('policy_batch', policy_batch, lambda: seeded([tasks] * 10, T, 'assignment')),
+                    ('policy_strictness_sweep', policy_strictness_sweep, lambda: seeded(tasks, T, np.linspace(0, 1, 11), 'assignment')),
+                    ('policy_multiday', policy_multiday, lambda: seeded(tasks, T, 7, 0)),
+                    ('policy_replan', policy_replan, lambda: seeded(tasks, plan_exact, T, 12, 'assignment'))]
+        if heavy:
+            policies.extend([('policy_random_traversal', policy_random_traversal, lambda: seeded(tasks, T, 5, 5)),
+                             ('policy_random_traversal_parallel', policy_random_traversal_parallel, lambda: seeded(tasks, T, 5, 5, None, seed))])
+        for name, func, setup in policies:
+            results.append(benchmark_func(name, func, setup, repeat, **info))
+
+        # Plan utilities (plan_order and plan_sort modify the given plan, so each call gets a copy)
+        results.append(benchmark_func('plan_rwd', plan_rwd, lambda: (plan_exact,), repeat, **info))
+        results.append(benchmark_func('plan_order', plan_order, lambda: (copy.deepcopy(plan_exact),), repeat, **info))
+        results.append(benchmark_func('plan_sort', plan_sort, lambda: (copy.deepcopy(plan_exact),), repeat, **info))
+
+    report = {'meta': {'python': platform.python_version(), 'numpy': np.__version__, 'platform': platform.platform(), 'repeat': repeat, \
+                       'seed': seed, 'time': time.strftime('%Y-%m-%dT%H:%M:%S')}, 'results': results}
+    if output is not None:
+        with open(output, 'w') as file:
+            json.dump(report, file, indent = 2)
+    return report
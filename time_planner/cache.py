@@ -0,0 +1,61 @@
+# Bounded memoization of reward values shared by all the planners
+from collections import OrderedDict
+
+from .rewards import reward_discrete, rwd_sleeping
+
+# Stable fingerprint of a task dict, as (part of) the key of cached rewards
+def task_fingerprint(task):
+    # The name does not change the reward, so tasks with the same definition share the same fingerprint
+    return tuple(sorted((key, tuple(value) if isinstance(value, list) else value) for key, value in task.items() if key != 'name'))
+
+# Bounded memoization of reward values with LRU (least recently used) eviction
+class RewardCache:
+    def __init__(self, maxsize = 65536):
+        # maxsize: max number of cached values, the least recently used one is evicted beyond it
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.values = OrderedDict()
+
+    # Return the cached value of 'key', or compute it by func() and cache it
+    def get(self, key, func):
+        if key in self.values:
+            self.hits += 1
+            self.values.move_to_end(key)
+            return self.values[key]
+
+        self.misses += 1
+        value = func()
+        self.values[key] = value
+        while len(self.values) > self.maxsize:
+            self.values.popitem(last = False)
+        return value
+
+    # Drop cached values when the todolist changes
+    def invalidate(self, tasks = None):
+        # tasks: None: drop everything; a task dict or a dict of tasks (e.g. from 'inputYAML'): drop only the values of these tasks
+        if tasks is None:
+            self.values.clear()
+            return
+
+        if 'type' in tasks:
+            tasks = {tasks.get('name', ''): tasks}
+        fingerprints = set(task_fingerprint(task) for task in tasks.values())
+        for key in [key for key in self.values if key[1] in fingerprints]:
+            self.values.pop(key)
+
+    # Hit/miss counters and current size
+    def info(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.values), 'maxsize': self.maxsize}
+
+reward_cache = RewardCache()
+
+# Memoized 'reward_discrete'
+def reward_discrete_cached(n, task, strictness, T, detailed = True):
+    key = ('reward_discrete', task_fingerprint(task), float(n), strictness, detailed, T)
+    return reward_cache.get(key, lambda: reward_discrete(n, task, strictness, T, detailed = detailed))
+
+# Memoized 'rwd_sleeping': the value does not depend on x, so x is not in the key
+def rwd_sleeping_cached(x, bedtime, duration, sleeping, strictness, T):
+    key = ('rwd_sleeping', task_fingerprint(sleeping), float(bedtime), float(duration), strictness)
+    return reward_cache.get(key, lambda: rwd_sleeping(x, bedtime, duration, sleeping, strictness, T))
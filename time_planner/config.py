@@ -0,0 +1,9 @@
+# Global settings of the planner: time slot length of the demos and procrastination
+
+T = 1               # Discrete time sampling window length of the demos in 'main'; the planner takes T in every planning call
+                    # For now, sampling length: 1 hour (min time on each task is 1h)
+                    # Suggested sampling time duration: 0.5 hour (30 mins) => similar to tomato time, time of human concentration
+                    # T <= 1 and 60*T must be integer (for now), so a good choice list for T: [1, 0.5, 1/3, 0.25, 0.2, 1/6, 0.1, 1/12]
+                    # corresponding min: [60, 30, 20, 15, 12, 10, 6, 5]
+
+procrastination = 1.5    # Approxinate procrastination time percentage based on approx_time
@@ -0,0 +1,128 @@
+# Population-based (genetic) optimizer: the whole population of plans is a 2-D array, scored, crossed, mutated and repaired by array ops
+import time
+
+import numpy as np
+
+from .inputs import input_analysis
+from .slots import sleep_grid, task_capacity
+from .tables import reward_table
+from .plan import Plan
+from .instrument import instrumented
+
+# Fitness of every individual, same as 'plan_rwd' of its plan: sum of the awake rwd (gathered from the reward table) × sleeping rwd
+def genetic_fitness(genes, choice, rwd_table_na, awake, sleep_rwd):
+    # Given:
+    #     genes: np.ndarray (population, n_slots) of task indices, Plan.NA for N/A; time slots asleep are ignored
+    #     choice: np.ndarray (population,) of the sleeping choice of each individual, flat index in the 'SleepGrid'
+    #     rwd_table_na: reward table with one more row of zeros at the end, so Plan.NA (-1) gathers 0
+    #     awake: np.ndarray (n_choices, n_slots) of bool, awake time slots of every sleeping choice
+    #     sleep_rwd: np.ndarray (n_choices,) of the sleeping rwd of every sleeping choice
+    # Return: np.ndarray (population,)
+    rwd = rwd_table_na[genes, np.arange(genes.shape[1])]
+    return np.sum(rwd * awake[choice], axis = 1) * sleep_rwd[choice]
+
+# Repair of every individual at once, same rule as 'policy_sort_disposable': the extra time slots of a task over its capacity
+# (once every day, or approx_time * procrastination) become N/A, chosen at random; time slots asleep also become N/A
+def genetic_repair(genes, choice, awake, capacity_na):
+    # capacity_na: np.ndarray (n_tasks + 1,) of the capacity of every task, and n_slots for N/A at the end
+    # Return: repaired genes, new array
+    genes = np.where(awake[choice], genes, Plan.NA)
+
+    # Sort the time slots of each individual by task, in a random order within the same task,
+    # then the rank of a time slot within its task is its position from the first time slot of the task
+    order = np.lexsort((np.random.random(genes.shape), genes), axis = -1)
+    genes_sorted = np.take_along_axis(genes, order, axis = 1)
+    position = np.broadcast_to(np.arange(genes.shape[1]), genes.shape)
+    first = np.ones(genes.shape, dtype = bool)
+    first[:, 1:] = genes_sorted[:, 1:] != genes_sorted[:, :-1]
+    rank = position - np.maximum.accumulate(np.where(first, position, 0), axis = 1)
+
+    repaired = np.empty_like(genes)
+    np.put_along_axis(repaired, order, np.where(rank >= capacity_na[genes_sorted], Plan.NA, genes_sorted), axis = 1)
+    return repaired
+
+# Genetic optimizer: each individual is a sleeping choice and a slot → task vector; the population evolves by tournament selection,
+# uniform crossover, mutation of time slots and of the sleeping choice (to a neighbouring one), repair, and elitism
+@instrumented
+def policy_genetic(tasks, T, population = 256, generations = 500, time_budget = None, mutation = None, sleep_mutation = 0.2, elite = 8, \
+                   rwd_table = None, sleep_step = None, collector = None):
+    # Given:
+    #     tasks: from input file
+    #     population: number of individuals
+    #     generations: max number of generations
+    #     time_budget: max wall-clock time in seconds, None for no limit; stop on whichever of generations and time_budget comes first
+    #     mutation: probability of each time slot to get a random task (or N/A), default: 2 / number of time slots
+    #     sleep_mutation: probability of each individual to move its bedtime and/or sleeping duration by one step
+    #     elite: number of the best individuals kept as they are in the next generation
+    #     rwd_table: (task, slot) reward table from 'reward_table', computed if not given
+    #     sleep_step: distance between the sleeping choices (see 'sleeping_choices')
+    #     collector: 'Collector' for the number of evaluated plans and the best rwd of every generation
+    # Return: the best plan found
+    strictness = tasks['today']['strictness']
+    task_names = input_analysis(tasks)
+    if rwd_table is None:
+        rwd_table = reward_table(tasks, task_names, strictness, T = T)
+    n_tasks, n_slots = rwd_table.shape
+    if mutation is None:
+        mutation = 2. / n_slots
+
+    rwd_table_na = np.vstack([rwd_table, np.zeros(n_slots)])
+    capacity_na = np.array([task_capacity(tasks[task_name], n_slots, T) for task_name in task_names] + [n_slots])
+
+    # All the sleeping choices, flattened: choice = bedtime index * len(duration_list) + duration index
+    grid = sleep_grid(tasks['sleeping'], strictness, T, step = sleep_step)
+    n_bedtime, n_duration = grid.rwd.shape
+    sleep_rwd = grid.rwd.reshape(-1)
+    awake = np.mod(np.arange(n_slots)[None, :] - grid.getup_slot.reshape(-1, 1), n_slots) < grid.n_awake.reshape(-1, 1)
+
+    # Random initial population, repaired
+    choice = np.random.randint(len(sleep_rwd), size = population)
+    genes = genetic_repair(np.random.randint(-1, n_tasks, size = (population, n_slots)), choice, awake, capacity_na)
+    fitness = genetic_fitness(genes, choice, rwd_table_na, awake, sleep_rwd)
+    evaluations = population
+
+    time_start = time.time()
+    for generation in range(generations):
+        if time_budget is not None and time.time() - time_start > time_budget:
+            break
+
+        # Tournament selection of two parents for every child: the better of two random individuals
+        contenders = np.random.randint(population, size = (2, population, 2))
+        parents = np.where(fitness[contenders[..., 0]] >= fitness[contenders[..., 1]], contenders[..., 0], contenders[..., 1])
+
+        # Uniform crossover of the time slots, and the sleeping choice of either parent
+        genes_new = np.where(np.random.random((population, n_slots)) < 0.5, genes[parents[0]], genes[parents[1]])
+        choice_new = np.where(np.random.random(population) < 0.5, choice[parents[0]], choice[parents[1]])
+
+        # Mutation: random tasks in random time slots, and neighbouring sleeping choices
+        mutated = np.random.random((population, n_slots)) < mutation
+        genes_new = np.where(mutated, np.random.randint(-1, n_tasks, size = (population, n_slots)), genes_new)
+        moved = np.random.random(population) < sleep_mutation
+        bedtime = np.clip(choice_new // n_duration + moved * np.random.randint(-1, 2, size = population), 0, n_bedtime - 1)
+        duration = np.clip(choice_new % n_duration + moved * np.random.randint(-1, 2, size = population), 0, n_duration - 1)
+        choice_new = bedtime * n_duration + duration
+
+        genes_new = genetic_repair(genes_new, choice_new, awake, capacity_na)
+        fitness_new = genetic_fitness(genes_new, choice_new, rwd_table_na, awake, sleep_rwd)
+        evaluations += population
+
+        # Elitism: the best individuals of the previous generation replace the worst children
+        best = np.argsort(-fitness)[:elite]
+        worst = np.argsort(fitness_new)[:elite]
+        genes_new[worst], choice_new[worst], fitness_new[worst] = genes[best], choice[best], fitness[best]
+        genes, choice, fitness = genes_new, choice_new, fitness_new
+
+        if collector is not None:
+            collector.record('policy_genetic.rwd', np.max(fitness))
+
+    # Best individual as a plan: sleeping from the grid, the awake time slots from the reward table
+    k = np.argmax(fitness)
+    bedtime, duration = grid.bedtime_list[choice[k] // n_duration], grid.duration_list[choice[k] % n_duration]
+    plan = Plan.from_dict(grid.layout(bedtime, duration)[0], task_names, T)
+    for n in np.flatnonzero(awake[choice[k]]):
+        plan.assign(n, genes[k, n], rwd_table_na[genes[k, n], n])
+
+    if collector is not None:
+        collector.count('genetic_evaluations', evaluations)
+    print('Reward max: ' + str(fitness[k]))
+    return plan.to_dict(tasks)
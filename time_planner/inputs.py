@@ -0,0 +1,55 @@
+# Input todolist: read from the YAML file and check the task params
+import os
+
+from .registry import task_types
+
+# Read input parameters from YAML file, default filename: 'todo.yaml'
+def inputYAML(filename = "todolist.yaml"):
+    # Return a dictionary of potential tasks with input parameters
+    import yaml         # Only needed to read the file, not for planning
+    if os.path.isfile(filename):
+        file = open(filename)
+        tasks = yaml.safe_load(file)
+        file.close()
+        return tasks
+    else:
+        raise Exception("Can't find the file '" + filename + "'")
+
+# Return task list from input 'tasks' dict, and check task validity
+def input_analysis(tasks):
+    # Given: dict of {task_name: task_content}
+    # Return: task_name list
+    task_names = list(tasks.keys())
+
+    # Check validity of task params: 'today', 'sleeping', and the schema of every registered task type
+    param = {'today': {'name', 'type', 'curr_time', 'day', 'strictness'}, \
+             'sleeping': {'name', 'type', 'duration_min', 'duration_max', 'bedtime_min', 'bedtime_max', 'enjoyment', 'productivity'}}
+    for task_type in task_types.values():
+        param[task_type.name] = task_type.params
+    wrong_param = []
+
+    # Check all necessary parameters for given tasks are provided in the input file
+    for task_name in task_names:
+        try:
+            diff = param[tasks[task_name]["type"]].difference(set(tasks[task_name].keys()))
+        except Exception as e:
+            print("Task '" + task_name + "' has missing or undefined {'type'}!")
+            wrong_param.append(task_name)
+            continue
+        
+        if diff != set():
+            print("Task '" + task_name + "' has missing parameter " + str(diff) + "!")
+            wrong_param.append(task_name)
+
+    # Check Task 'today' and 'sleeping' are provided
+    diff = set(['today', 'sleeping']).difference(set(task_names))
+    if diff != set():
+        print("Inputs has missing Task " + str(diff) + "!")
+    else:
+        task_names.remove('today')
+        task_names.remove('sleeping')        
+
+    if len(wrong_param) != 0:
+        raise Exception("Check inputs of " + str(set(wrong_param)) + " and try again!")
+
+    return task_names
@@ -0,0 +1,92 @@
+# Opt-in instrumentation of the policies
+import inspect
+import json
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+from .cache import reward_cache
+
+# Opt-in instrumentation of the policies: counters, timers and per-iteration trajectories, passed to a policy as 'collector'
+# Policies only touch it behind 'if collector is not None', so planning without a collector costs nothing more
+class Collector:
+    def __init__(self):
+        self.counters = {}
+        self.timers = {}            # name -> [total seconds, number of calls]
+        self.trajectories = {}      # name -> list of [seconds since the start, value]
+        self.events = []            # [name, start, duration] in seconds since the start, for the Chrome trace
+        self.start_time = time.perf_counter()
+        self.depth = 0              # Number of nested instrumented calls in progress
+
+    def count(self, name, k = 1):
+        self.counters[name] = self.counters.get(name, 0) + k
+
+    # Add a point (e.g. the rwd after each horizon) to the trajectory 'name'
+    def record(self, name, value):
+        self.trajectories.setdefault(name, []).append([time.perf_counter() - self.start_time, float(value)])
+
+    @contextmanager
+    def timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            timer = self.timers.setdefault(name, [0., 0])
+            timer[0] += end - start
+            timer[1] += 1
+            self.events.append([name, start - self.start_time, end - start])
+
+    def to_dict(self):
+        timers = {name: {'seconds': timer[0], 'calls': timer[1]} for name, timer in self.timers.items()}
+        return {'counters': dict(self.counters), 'timers': timers, 'trajectories': self.trajectories}
+
+    # Save as JSON if filename is given; Return the JSON string
+    def to_json(self, filename = None):
+        text = json.dumps(self.to_dict(), indent = 2)
+        if filename is not None:
+            with open(filename, 'w') as file:
+                file.write(text)
+        return text
+
+    # Chrome trace format (chrome://tracing, Perfetto): timers as complete events, trajectories as counter events
+    def to_chrome_trace(self, filename = None):
+        pid = os.getpid()
+        trace = [{'name': name, 'ph': 'X', 'ts': start * 1e6, 'dur': duration * 1e6, 'pid': pid, 'tid': 0} for name, start, duration in self.events]
+        for name, points in self.trajectories.items():
+            trace.extend({'name': name, 'ph': 'C', 'ts': t * 1e6, 'pid': pid, 'tid': 0, 'args': {name: value}} for t, value in points)
+        text = json.dumps({'traceEvents': trace, 'otherData': {'counters': self.counters}})
+        if filename is not None:
+            with open(filename, 'w') as file:
+                file.write(text)
+        return text
+
+# Timer of the collector, or nothing if there is no collector
+def timed(collector, name):
+    if collector is None:
+        return nullcontext()
+    return collector.timer(name)
+
+# Time the whole call of a function with a 'collector' argument, and count the reward cache hits and misses during the call
+# (only for the outermost instrumented call, so that nested policies are not counted twice)
+def instrumented(func):
+    index = list(inspect.signature(func).parameters).index('collector')
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        collector = kwargs.get('collector', args[index] if len(args) > index else None)
+        if collector is None:
+            return func(*args, **kwargs)
+        hits, misses = reward_cache.hits, reward_cache.misses
+        collector.depth += 1
+        try:
+            with collector.timer(func.__name__):
+                result = func(*args, **kwargs)
+        finally:
+            collector.depth -= 1
+        if collector.depth == 0:
+            collector.count('reward_cache_hits', reward_cache.hits - hits)
+            collector.count('reward_cache_misses', reward_cache.misses - misses)
+        return result
+    return wrapper
@@ -0,0 +1,199 @@
+# Plans of one day: array-backed plan, incremental scoring, and utilities of the dict plan
+import numpy as np
+
+from .instrument import instrumented
+
+# Compact plan of one day backed by arrays: the task index and rwd of each time slot [n * T, (n + 1) * T]
+# Convert from/to the dict plan (keys of task type with '_' suffixes) by 'Plan.from_dict' and 'to_dict', e.g. for 'plan_sort' and 'visualize_plan'
+class Plan:
+    __slots__ = ('task_names', 'task', 'rwd', 'T')
+
+    NA = -1             # No task in the time slot: 'N/A'
+    SLEEPING = -2
+
+    def __init__(self, task_names, T):
+        # task_names: list of task names, 'task' of each time slot is the index in it (or NA, SLEEPING)
+        n_slots = int(round(24 / T))
+        self.task_names = task_names
+        self.task = np.full(n_slots, Plan.NA)
+        self.rwd = np.zeros(n_slots)
+        self.T = T
+
+    # Replace the task in time slot n by task index i with reward rwd, O(1)
+    def assign(self, n, i, rwd):
+        self.task[n] = i
+        self.rwd[n] = rwd
+
+    def copy(self):
+        plan = Plan(self.task_names, self.T)
+        plan.task[:] = self.task
+        plan.rwd[:] = self.rwd
+        return plan
+
+    # All the time slots except sleeping
+    def awake_slots(self):
+        return np.flatnonzero(self.task != Plan.SLEEPING)
+
+    # Total reward, same as 'plan_rwd' of the dict plan
+    def reward(self, sleeping = True):
+        asleep = self.task == Plan.SLEEPING
+        if not sleeping:
+            return np.sum(self.rwd)
+        return np.sum(self.rwd[~asleep]) * self.rwd[np.argmax(asleep)]
+
+    @classmethod
+    def from_dict(cls, plan, task_names, T):
+        newplan = cls(task_names, T)
+        task_index = {task_name: i for i, task_name in enumerate(task_names)}
+        for task in plan.values():
+            start = int(round(task['time'][0] / T))
+            end = int(round(task['time'][1] / T))
+            if task['name'] == 'sleeping':
+                newplan.task[start:end] = Plan.SLEEPING
+            elif task['name'] == 'N/A':
+                newplan.task[start:end] = Plan.NA
+            else:
+                newplan.task[start:end] = task_index[task['name']]
+            rwd = task['rwd'][:end - start]
+            newplan.rwd[start:start + len(rwd)] = rwd
+        return newplan
+
+    # Dict plan in the time order: one key for each sleeping period, and one key for each other time slot
+    def to_dict(self, tasks):
+        plan = {}
+        count = {}
+        n_slots = len(self.task)
+        n = 0
+        while n < n_slots:
+            i = self.task[n]
+            end = n + 1
+            if i == Plan.SLEEPING:
+                while end < n_slots and self.task[end] == Plan.SLEEPING:
+                    end += 1
+                task_name, task_type = 'sleeping', 'sleeping'
+            elif i == Plan.NA:
+                task_name, task_type = 'N/A', 'NA'
+            else:
+                task_name = self.task_names[i]
+                task_type = tasks[task_name]['type']
+
+            count[task_type] = count.get(task_type, -1) + 1
+            plan[task_type + count[task_type] * '_'] = {'name': task_name, 'time': [n * self.T, end * self.T], 'rwd': list(self.rwd[n:end])}
+            n = end
+        return plan
+
+# Incremental total reward of a 'Plan' during local search, same as 'plan_rwd' (awake rwd multiplied by sleeping rwd)
+# Each move (replace one time slot, or swap two) is scored and applied in O(1) instead of a full rescan of the plan
+class PlanScorer:
+    __slots__ = ('plan', 'rwd_table', 'awake_rwd', 'sleeping_rwd')
+
+    def __init__(self, plan, rwd_table):
+        # plan: 'Plan', modified in place by the moves; only awake time slots should be moved
+        # rwd_table: (task, slot) reward table, rows in the order of plan.task_names
+        self.plan = plan
+        self.rwd_table = rwd_table
+        self.rescore()
+
+    # Full recompute of the running total, e.g. after the plan is modified outside the scorer
+    def rescore(self):
+        asleep = self.plan.task == Plan.SLEEPING
+        self.sleeping_rwd = self.plan.rwd[np.argmax(asleep)] if np.any(asleep) else 1
+        self.awake_rwd = np.sum(self.plan.rwd[~asleep])
+
+    def total(self):
+        return self.awake_rwd * self.sleeping_rwd
+
+    # Reward of task i (Plan.NA for N/A) in time slot n
+    def slot_rwd(self, n, i):
+        if i < 0:
+            return 0.
+        return self.rwd_table[i, n]
+
+    # Change of the total if task i is put into time slot n
+    def delta_replace(self, n, i):
+        return (self.slot_rwd(n, i) - self.plan.rwd[n]) * self.sleeping_rwd
+
+    def replace(self, n, i):
+        rwd = self.slot_rwd(n, i)
+        self.awake_rwd += rwd - self.plan.rwd[n]
+        self.plan.assign(n, i, rwd)
+
+    # Change of the total if the tasks in time slots n1 and n2 are swapped
+    def delta_swap(self, n1, n2):
+        i1, i2 = self.plan.task[n1], self.plan.task[n2]
+        return (self.slot_rwd(n1, i2) + self.slot_rwd(n2, i1) - self.plan.rwd[n1] - self.plan.rwd[n2]) * self.sleeping_rwd
+
+    def swap(self, n1, n2):
+        i1, i2 = self.plan.task[n1], self.plan.task[n2]
+        self.replace(n1, i2)
+        self.replace(n2, i1)
+
+# Calculate total reward from a given complete plan
+def plan_rwd(plan, sleeping = True):
+    # sleeping: True: Multiply sleeping rwd; False: Add it with others
+    reward = 0
+    if not sleeping:
+        for task in plan.keys():
+            for rwd in plan[task]['rwd']:
+                reward += rwd
+    elif sleeping:
+        sleeping_rwd = plan['sleeping']['rwd'][0]
+        for task in plan.keys():
+            if task.strip('_') == 'sleeping':
+                continue
+            else:
+                for rwd in plan[task]['rwd']:
+                    reward += rwd
+        reward = reward * sleeping_rwd
+
+    return reward
+
+# Make the tasks in the time order
+@instrumented
+def plan_order(plan, collector = None):
+    newplan = {}
+    task_names = list(plan.keys())
+
+    # All the tasks in the same order
+    time_list = []
+    for task in task_names:
+        time_list.append(plan[task]['time'][0])
+    time_index = np.argsort(time_list)
+    task_names = list(np.array(task_names)[time_index])
+    
+    for i in range(len(plan)):
+        newplan[task_names[i]] = plan[task_names[i]]
+
+    return newplan
+
+# Make the 'Initial plan' more neat: same continuous task in the same dict.key, all the tasks in the time order
+@instrumented
+def plan_sort(plan, collector = None):
+    newplan = {}
+    task_names = list(plan.keys())
+
+    # All the tasks in the same order
+    time_list = []
+    for task in task_names:
+        time_list.append(plan[task]['time'][0])
+    time_index = np.argsort(time_list)
+    task_names = list(np.array(task_names)[time_index])
+
+    # Same continuous task in the same key
+    newplan[task_names[0]] = plan[task_names[0]]
+    for i in range(1, len(plan)):
+        last_task = list(newplan.keys())[-1]
+        if task_names[i].strip('_') == last_task.strip('_') and plan[task_names[i]]['name'] == plan[last_task]['name']:
+            time_ori = newplan[last_task]['time']
+            time_new = plan[task_names[i]]['time']      # '_new': relative to 'newplan' reconstruction
+
+            if time_ori[1] == time_new[0]:
+                newplan[last_task]['time'] = [time_ori[0], time_new[1]]
+                newplan[last_task]['rwd'].extend(plan[task_names[i]]['rwd'])
+            else:
+                newplan[task_names[i]] = plan[task_names[i]]
+        else:
+            newplan[task_names[i]] = plan[task_names[i]]
+
+    # print('Sorted plan: ' + str(newplan))
+    return newplan
@@ -0,0 +1,820 @@
+# Planning policies: random initial plans, local search, annealing, exact traversal and their multi-plan variants
+import random
+import time
+
+import numpy as np
+
+from .inputs import input_analysis
+from .slots import slot_ceil, sleeping_choices, sleeping_plan, sleep_grid, task_capacity
+from .tables import reward_table, reward_table_batch, reward_table_strictness, reward_table_days
+from .plan import Plan, PlanScorer, plan_rwd
+from .solvers import plan_from_assignment, assignment_dp, assignment_lsa
+from .instrument import timed, instrumented
+from .registry import task_type_of
+
+# Names of the disposable tasks (done once every day, see 'registry'), looked up once before the loops of the random policies
+def disposable_tasks(tasks, task_names):
+    return set(task_name for task_name in task_names if task_type_of(tasks[task_name]).disposable)
+
+# Number of picks after which each task is no longer a candidate of the random policies: its capacity if its type has a capacity rule
+# (see 'task_capacity'), no limit otherwise
+def task_limits(tasks, task_names, n_slots, T):
+    return {task_name: task_capacity(tasks[task_name], n_slots, T) if task_type_of(tasks[task_name]).limited else np.inf for task_name in task_names}
+
+# Only consider plan for tomorrow (for now => TODO: future extension for plan for the same day)
+# Policy random: naive, initial, randomly distribute any task for any T
+@instrumented
+def policy_random(tasks, T, rwd_table = None, collector = None):
+    # Extract 'strictness' info from input
+    strictness = tasks['today']['strictness']
+
+    # Look up rewards from the (task, slot) reward table instead of recomputing 'reward_discrete' for every candidate
+    task_names = input_analysis(tasks)
+    if rwd_table is None:
+        rwd_table = reward_table(tasks, task_names, strictness, T = T)
+    task_index = {task_name: i for i, task_name in enumerate(task_names)}
+
+    # Plan about 'sleeping': a random choice from the sleeping grid of the todolist
+    grid = sleep_grid(tasks['sleeping'], strictness, T)
+    bedtime = random.choice(grid.bedtime_list)
+    duration = random.choice(grid.duration_list)
+    print('bedtime: ' + str(np.mod(bedtime, 24)) + ':00\tduration: ' + str(duration) + 'h\tgetup time: ' + str(np.mod(bedtime + duration, 24)) + ':00')
+
+    # Sleeping in the plan, and the awake time slots left for other tasks
+    plan, time_list = grid.layout(bedtime, duration)
+
+    # Add random tasks into 'plan'; disposable tasks only once (the type of each task is looked up once, not in the loop)
+    plan_new = Plan.from_dict(plan, task_names, T)
+    disposable = disposable_tasks(tasks, task_names)
+    task_names_copy = task_names[:]
+    for n in time_list:
+        task_curr = random.choice(task_names_copy)
+        plan_new.assign(n, task_index[task_curr], rwd_table[task_index[task_curr], n])
+
+        if task_curr in disposable:
+            task_names_copy.remove(task_curr)   # TODO: long_term may not remove if T≠1: count the number of the long_term tasks => modify the rwd value
+
+    return plan_new.to_dict(tasks)
+
+# Modify rwd func in policy_random to take approx_time into consideration for fixed_ddl and asap tasks => Question: Is it really necessary? Just to generate a moderately better initial plan, for following optimize procedure
+@instrumented
+def policy_random_modify(tasks, T, rwd_table = None, collector = None):
+    # Extract 'strictness' info from input
+    strictness = tasks['today']['strictness']
+
+    # Look up rewards from the (task, slot) reward table instead of recomputing 'reward_discrete' for every candidate
+    task_names = input_analysis(tasks)
+    if rwd_table is None:
+        rwd_table = reward_table(tasks, task_names, strictness, T = T)
+    task_index = {task_name: i for i, task_name in enumerate(task_names)}
+
+    # Plan about 'sleeping': a random choice from the sleeping grid of the todolist
+    grid = sleep_grid(tasks['sleeping'], strictness, T)
+    bedtime = random.choice(grid.bedtime_list)
+    duration = random.choice(grid.duration_list)
+    print('bedtime: ' + str(np.mod(bedtime, 24)) + ':00\tduration: ' + str(duration) + 'h\tgetup time: ' + str(np.mod(bedtime + duration, 24)) + ':00')
+
+    # Sleeping in the plan, and the awake time slots left for other tasks
+    plan, time_list = grid.layout(bedtime, duration)
+
+    # Add random tasks into 'plan', each task within its capacity
+    plan_new = Plan.from_dict(plan, task_names, T)
+    limits = task_limits(tasks, task_names, len(plan_new.task), T)
+    task_names_copy = task_names[:]
+    task_count = {}
+    for n in time_list:
+        # A random task among the remaining ones with a nonzero rwd in this time slot, or among all the remaining ones if there is none
+        remaining = np.array([task_index[task_name] for task_name in task_names_copy])
+        candidates = remaining[np.flatnonzero(rwd_table[remaining, n] != 0)]
+        if len(candidates) == 0:
+            candidates = remaining
+        task_curr = task_names[random.choice(candidates)]
+        plan_new.assign(n, task_index[task_curr], rwd_table[task_index[task_curr], n])
+
+        task_count[task_curr] = task_count.get(task_curr, 0) + 1
+        if task_count[task_curr] >= limits[task_curr]:
+            task_names_copy.remove(task_curr)
+
+    return plan_new.to_dict(tasks)
+
+# Given fixed bedtime and sleeping duration, randomly generate a plan (similar to 'policy_random' function)
+@instrumented
+def policy_random_given_sleeping(tasks, bedtime, duration, T, rwd_table = None, collector = None):
+    # Extract 'strictness' info from input
+    strictness = tasks['today']['strictness']
+
+    # Look up rewards from the (task, slot) reward table instead of recomputing 'reward_discrete' for every candidate
+    task_names = input_analysis(tasks)
+    if rwd_table is None:
+        rwd_table = reward_table(tasks, task_names, strictness, T = T)
+    task_index = {task_name: i for i, task_name in enumerate(task_names)}
+
+    # Plan about 'sleeping': the given choice from the sleeping grid of the todolist
+    grid = sleep_grid(tasks['sleeping'], strictness, T)
+    if not np.any(np.isclose(grid.bedtime_list, bedtime)):
+        raise Exception('Wrong input of bedtime in policy_random_given_sleeping function')
+    if not np.any(np.isclose(grid.duration_list, duration)):
+        raise Exception('Wrong input of duration in policy_random_given_sleeping function')
+    print('bedtime: ' + str(np.mod(bedtime, 24)) + ':00\tduration: ' + str(duration) + 'h\tgetup time: ' + str(np.mod(bedtime + duration, 24)) + ':00')
+
+    # Sleeping in the plan, and the awake time slots left for other tasks
+    plan, time_list = grid.layout(bedtime, duration)
+
+    # Add random tasks into 'plan'; disposable tasks only once (the type of each task is looked up once, not in the loop)
+    plan_new = Plan.from_dict(plan, task_names, T)
+    disposable = disposable_tasks(tasks, task_names)
+    task_names_copy = task_names[:]
+    for n in time_list:
+        task_curr = random.choice(task_names_copy)
+        plan_new.assign(n, task_index[task_curr], rwd_table[task_index[task_curr], n])
+
+        if task_curr in disposable:
+            task_names_copy.remove(task_curr)   # TODO: long_term may not remove if T≠1: count the number of the long_term tasks => modify the rwd value
+
+    return plan_new.to_dict(tasks)
+
+# One cycle of random replacement: for each awake time slot, replace the task with a random one that increases the total rwd (within 'search_cycle' trials)
+def random_replacement(tasks, scorer, task_index, search_cycle, collector = None):
+    # Given:
+    #     scorer: 'PlanScorer' of the plan, the plan is modified in place
+    #     task_index: row index of each task name in the reward table
+    #     collector: 'Collector' for the number of rwd evaluations and accepted replacements
+    # Return: number of accepted replacements
+    # The candidates are the tasks below their capacity in the plan: the time slots a task already takes count, so a plan within
+    # the capacity of every task stays within it
+    plan = scorer.plan
+    limits = task_limits(tasks, list(task_index.keys()), len(plan.task), plan.T)
+    counts = np.bincount(plan.task[plan.task >= 0], minlength = len(plan.task_names))
+    task_count = {task_name: counts[i] for task_name, i in task_index.items()}
+    task_names_copy = [task_name for task_name in task_index if task_count[task_name] < limits[task_name]]
+    evaluations = 0
+    accepted = 0
+
+    for n in plan.awake_slots():
+        for j in range(search_cycle):
+            if len(task_names_copy) == 0:
+                break
+            task_replace = random.choice(task_names_copy)
+
+            evaluations += 1
+            if scorer.delta_replace(n, task_index[task_replace]) > 0:
+                i_old = plan.task[n]
+                scorer.replace(n, task_index[task_replace])
+                accepted += 1
+
+                task_count[task_replace] += 1
+                if task_count[task_replace] >= limits[task_replace]:
+                    task_names_copy.remove(task_replace)
+                if i_old >= 0:
+                    task_old = plan.task_names[i_old]
+                    task_count[task_old] -= 1
+                    if task_count[task_old] == limits[task_old] - 1:
+                        task_names_copy.append(task_old)        # Below its capacity again
+                break
+
+    if collector is not None:
+        collector.count('rwd_evaluations', evaluations)
+        collector.count('replacements_accepted', accepted)
+    return accepted
+
+# Based on the plan generated from policy_random(_modify) and replace randomly with tasks of higher rwd => local optimal result
+@instrumented
+def policy_random_optimal(tasks, plan, T, horizon = 5, search_cycle = 7, rwd_table = None, collector = None):
+    # Given:
+    #     tasks: from input file
+    #     plan: randomly generated plan from policy_random, unsorted, may or may not ordered
+    #     horizon: number of cycle to thoroughly search and replace task in each T 
+    #     search_cycle: number of random generation for each task's replacement search
+    #     rwd_table: (task, slot) reward table from 'reward_table', computed if not given
+    # Return: new plan with a higher total rwd over the day
+
+    # Extract 'strictness' info from input
+    strictness = tasks['today']['strictness']
+
+    # Look up rewards from the (task, slot) reward table instead of recomputing 'reward_discrete' for every candidate
+    task_names = input_analysis(tasks)
+    if rwd_table is None:
+        rwd_table = reward_table(tasks, task_names, strictness, T = T)
+    task_index = {task_name: i for i, task_name in enumerate(task_names)}
+
+    # Init: copy plan to plan_new
+    plan_new = Plan.from_dict(plan, task_names, T)
+
+    scorer = PlanScorer(plan_new, rwd_table)
+    for i in range(horizon):
+        # Search through all the time slots in the plan
+        # Not consider about the time limit of each task for now => updated in 'policy_random_optimal_disposal' function
+        accepted = random_replacement(tasks, scorer, task_index, search_cycle, collector)
+        if collector is not None:
+            collector.record('policy_random_optimal.rwd', scorer.total())
+            collector.record('policy_random_optimal.accepted', accepted)
+
+    return plan_new.to_dict(tasks)
+
+# Remove disposable tasks (tasks that only need to do once every day)
+# Disposable task type includes: 'fun', 'necessity', 'meal', 'long_term'
+# Special disposable task type includes: 'as_soon_as_possible', 'fixed_ddl' that exceeds approx_time * procrastination
+@instrumented
+def policy_sort_disposable(tasks, plan, T = None, collector = None):
+    # Given: 
+    #     tasks: dictionary of all the task info
+    #     plan: origional plan to be sorted, dict or 'Plan'
+    #     T: time slot length of a dict plan, required for it ('Plan' carries its own)
+    # Return: newplan: remove repetitive disposable tasks by N/A, same format as the given plan
+    if isinstance(plan, dict):
+        if T is None:
+            raise Exception("Time slot length T is required to sort a dict plan")
+        return policy_sort_disposable(tasks, Plan.from_dict(plan, input_analysis(tasks), T)).to_dict(tasks)
+
+    newplan = plan.copy()
+    n_slots = len(newplan.task)
+    for i, task_name in enumerate(newplan.task_names):
+        slots = np.flatnonzero(newplan.task == i)
+        extra_time = len(slots) - task_capacity(tasks[task_name], n_slots, newplan.T)
+        if extra_time > 0:
+            for n in np.random.choice(slots, extra_time, replace = False):
+                newplan.assign(n, Plan.NA, 0)
+
+    return newplan
+
+# Apply disposable task removal in every 'horizon' cycle in 'policy_random_optimal'
+@instrumented
+def policy_random_optimal_disposal(tasks, plan, T, horizon = 5, search_cycle = 7, rwd_table = None, collector = None):
+    # Given:
+    #     tasks: from input file
+    #     plan: randomly generated plan from policy_random, unsorted, may or may not ordered
+    #     horizon: number of cycle to thoroughly search and replace task in each T 
+    #     search_cycle: number of random generation for each task's replacement search
+    #     rwd_table: (task, slot) reward table from 'reward_table', computed if not given
+    # Return: new plan with a higher total rwd over the day
+
+    # Extract 'strictness' info from input
+    strictness = tasks['today']['strictness']
+
+    # Look up rewards from the (task, slot) reward table instead of recomputing 'reward_discrete' for every candidate
+    task_names = input_analysis(tasks)
+    if rwd_table is None:
+        rwd_table = reward_table(tasks, task_names, strictness, T = T)
+    task_index = {task_name: i for i, task_name in enumerate(task_names)}
+
+    # Init: copy plan to plan_new
+    plan_new = Plan.from_dict(plan, task_names, T)
+
+    for i in range(horizon):
+        # Remove extra disposable tasks; wait to enter next optimizing 'horizon' loop
+        plan_new = policy_sort_disposable(tasks, plan_new, collector = collector)
+
+        # Search through all the time slots in the plan
+        # Now consider about the time limit of each task for now
+        # The plan is a new one after the removal: score it once, then update incrementally
+        scorer = PlanScorer(plan_new, rwd_table)
+        with timed(collector, 'random_replacement'):
+            accepted = random_replacement(tasks, scorer, task_index, search_cycle, collector)
+        if collector is not None:
+            collector.record('policy_random_optimal_disposal.rwd', scorer.total())
+            collector.record('policy_random_optimal_disposal.accepted', accepted)
+
+    # The returned plan is within the capacity of every task, so its rwd can be compared with exact bounds (e.g. 'prune')
+    plan_new = policy_sort_disposable(tasks, plan_new, collector = collector)
+    return plan_new.to_dict(tasks)
+
+# Simulated annealing from a given plan: random moves are always accepted if better, and with probability exp(delta / temperature) if worse
+@instrumented
+def policy_annealing(tasks, plan, T, iterations = 20000, time_budget = None, temperature = 1, cooling = 'exponential', rwd_table = None, collector = None):
+    # Given:
+    #     tasks: from input file
+    #     plan: initial plan, e.g. from 'policy_random' or 'policy_random_given_sleeping'
+    #     iterations: max number of moves
+    #     time_budget: max wall-clock time in seconds, None for no limit; stop on whichever of iterations and time_budget comes first
+    #     temperature: initial temperature, in the unit of plan_rwd
+    #     cooling: cooling schedule over the progress p ∈ [0, 1] of the iterations (or time_budget):
+    #         'exponential': temperature * 0.001^p; 'linear': temperature * (1 - p); 'logarithmic': temperature / log(e + k) for the k-th move
+    #     rwd_table: (task, slot) reward table from 'reward_table', computed if not given
+    #     collector: 'Collector' for the number of moves, and the rwd and temperature trajectories (every 100 moves)
+    # Return: the best plan found
+    # Moves:
+    #     replace the task in an awake time slot by a random task (or N/A) within the task capacity
+    #     swap the tasks in two awake time slots
+    #     (less often) move the bedtime or sleeping duration to a neighbouring choice of 'sleeping_choices'
+    if cooling not in ['exponential', 'linear', 'logarithmic']:
+        raise Exception("Undefined cooling schedule '" + str(cooling) + "' for policy_annealing")
+
+    # Extract 'strictness' info from input
+    strictness = tasks['today']['strictness']
+
+    task_names = input_analysis(tasks)
+    if rwd_table is None:
+        rwd_table = reward_table(tasks, task_names, strictness, T = T)
+
+    # Start from a plan within the capacity of every task
+    plan_new = policy_sort_disposable(tasks, Plan.from_dict(plan, task_names, T))
+    n_slots = len(plan_new.task)
+    capacity = np.array([task_capacity(tasks[task_name], n_slots, T) for task_name in task_names])
+    count = np.bincount(plan_new.task[plan_new.task >= 0], minlength = len(task_names))
+    scorer = PlanScorer(plan_new, rwd_table)
+    awake_slots = list(plan_new.awake_slots())
+
+    # Current sleeping choice, found from the sleeping time slots of the plan (same layout as in 'sleeping_plan')
+    grid = sleep_grid(tasks['sleeping'], strictness, T)
+    bedtime_list, duration_list = grid.bedtime_list, grid.duration_list
+    asleep = plan_new.task == Plan.SLEEPING
+    if asleep[0] and asleep[-1]:
+        bedtime = (np.flatnonzero(~asleep)[-1] + 1) * T
+    else:
+        bedtime = np.argmax(asleep) * T
+    b = np.argmin(np.abs(np.mod(bedtime_list - bedtime + 12, 24) - 12))       # Closest on the 24h circle
+    d = np.argmin(np.abs(duration_list - np.sum(asleep) * T))
+
+    plan_max = plan_new.copy()
+    rwd_max = scorer.total()
+
+    moves = 0
+    accepted = 0
+    time_start = time.time()
+    for k in range(iterations):
+        if time_budget is not None:
+            elapsed = time.time() - time_start
+            if elapsed > time_budget:
+                break
+            progress = max(k / iterations, elapsed / time_budget)
+        else:
+            progress = k / iterations
+        moves += 1          # Counted once the move is attempted, not for the iteration that runs out of budget
+
+        if cooling == 'exponential':
+            temp = temperature * 0.001 ** progress
+        elif cooling == 'linear':
+            temp = temperature * (1 - progress)
+        else:
+            temp = temperature / np.log(np.e + k)
+        if collector is not None and k % 100 == 0:
+            collector.record('policy_annealing.rwd', scorer.total())
+            collector.record('policy_annealing.temperature', temp)
+
+        move = random.random()
+        if move < 0.05 or len(awake_slots) < 2:
+            # Move the sleeping choice: time slots that become asleep lose their tasks, time slots that wake up are N/A
+            b_new = min(max(b + random.choice([-1, 0, 1]), 0), len(bedtime_list) - 1)
+            d_new = min(max(d + random.choice([-1, 0, 1]), 0), len(duration_list) - 1)
+            if (b_new, d_new) == (b, d):
+                continue
+            sleep_plan = Plan.from_dict(grid.layout(bedtime_list[b_new], duration_list[d_new])[0], task_names, T)
+            asleep = sleep_plan.task == Plan.SLEEPING
+            task_new = np.where(asleep, Plan.SLEEPING, np.where(plan_new.task == Plan.SLEEPING, Plan.NA, plan_new.task))
+            rwd_new = np.where(asleep, sleep_plan.rwd, np.where(plan_new.task == Plan.SLEEPING, 0, plan_new.rwd))
+            delta = np.sum(rwd_new[~asleep]) * rwd_new[np.argmax(asleep)] - scorer.total()
+            if delta >= 0 or (temp > 0 and random.random() < np.exp(delta / temp)):
+                b, d = b_new, d_new
+                plan_new.task[:] = task_new
+                plan_new.rwd[:] = rwd_new
+                scorer.rescore()
+                count = np.bincount(plan_new.task[plan_new.task >= 0], minlength = len(task_names))
+                awake_slots = list(plan_new.awake_slots())
+            else:
+                continue
+        elif move < 0.5:
+            # Replace
+            n = random.choice(awake_slots)
+            i = random.randrange(-1, len(task_names))
+            i_curr = plan_new.task[n]
+            if i == i_curr or (i >= 0 and count[i] >= capacity[i]):
+                continue
+            delta = scorer.delta_replace(n, i)
+            if delta >= 0 or (temp > 0 and random.random() < np.exp(delta / temp)):
+                scorer.replace(n, i)
+                if i_curr >= 0:
+                    count[i_curr] -= 1
+                if i >= 0:
+                    count[i] += 1
+            else:
+                continue
+        else:
+            # Swap
+            n1, n2 = random.sample(awake_slots, 2)
+            delta = scorer.delta_swap(n1, n2)
+            if delta >= 0 or (temp > 0 and random.random() < np.exp(delta / temp)):
+                scorer.swap(n1, n2)
+            else:
+                continue
+
+        accepted += 1
+        if scorer.total() > rwd_max:
+            rwd_max = scorer.total()
+            plan_max = plan_new.copy()
+
+    if collector is not None:
+        collector.count('annealing_moves', moves)
+        collector.count('annealing_accepted', accepted)
+    print('Reward max: ' + str(rwd_max))
+    return plan_max.to_dict(tasks)
+
+# Sleeping choices of a traversal: all of them in the grid order, or with 'prune' in the decreasing order of their upper bound
+def traversal_choices(grid, rwd_table, prune = False):
+    # Given: grid: 'SleepGrid'; rwd_table: (task, slot) reward table
+    # Return: list of (bedtime, duration, upper bound of plan_rwd), bound = inf without 'prune'
+    choices = grid.choices()
+    if not prune:
+        return [(bedtime, duration, np.inf) for bedtime, duration in choices]
+    bounds = grid.bounds(rwd_table).reshape(-1)
+    return [choices[k] + (bounds[k],) for k in np.argsort(-bounds, kind = 'stable')]
+
+# Print and count the sleeping choices skipped by pruning
+def report_pruned(pruned, total, collector = None):
+    print('Pruned sleeping choices: ' + str(pruned) + ' of ' + str(total))
+    if collector is not None:
+        collector.count('pruned_choices', pruned)
+
+# Traverse through all the bedtime and sleeping duration, use 'policy_random_optimal_disposal' to find the local optimal within the given 'horizon' and 'search_cycle'; compare all the optimals and return the max rwd
+# prune: branch and bound: traverse the sleeping choices in the decreasing order of their upper bound of plan_rwd
+#        (from 'SleepGrid.bounds'), and stop at the first one whose bound is not above the best rwd found so far
+@instrumented
+def policy_random_traversal(tasks, T, horizon = 5, search_cycle = 5, sleep_step = None, prune = False, collector = None):
+    plan_max = {}
+    rwd_max = 0
+
+    # The reward table does not depend on the sleeping choice: compute once for all the traversal
+    task_names = input_analysis(tasks)
+    rwd_table = reward_table(tasks, task_names, tasks['today']['strictness'], T = T)
+
+    choices = traversal_choices(sleep_grid(tasks['sleeping'], tasks['today']['strictness'], T, step = sleep_step), rwd_table, prune)
+    pruned = 0
+    for k, (bedtime, duration, bound) in enumerate(choices):
+        if bound <= rwd_max:
+            # Decreasing order of the bound: none of the remaining choices can beat the best one either
+            pruned = len(choices) - k
+            break
+        plan = policy_random_given_sleeping(tasks, bedtime, duration, T, rwd_table = rwd_table, collector = collector)
+        plan = policy_random_optimal_disposal(tasks, plan, T, horizon = horizon, search_cycle = search_cycle, rwd_table = rwd_table, collector = collector)
+        rwd = plan_rwd(plan)
+        if collector is not None:
+            collector.record('policy_random_traversal.rwd', rwd)
+        if rwd > rwd_max:
+            rwd_max = rwd
+            plan_max = {}
+            for task in plan.keys():
+                plan_max[task] = plan[task]
+
+        del plan, rwd
+
+    if prune:
+        report_pruned(pruned, len(choices), collector)
+    print('Reward max: ' + str(rwd_max))
+    return plan_max
+
+# One job of the traversal for a given bedtime and sleeping duration, with its own random seed (run in a worker process)
+def traversal_job(tasks, bedtime, duration, horizon, search_cycle, rwd_table, seed, T):
+    # rwd_table: reward table, or the path of its .npy file (e.g. from 'PlanStore'), opened read-only and memory-mapped in the worker
+    if isinstance(rwd_table, str):
+        rwd_table = np.load(rwd_table, mmap_mode = 'r')
+    random.seed(seed)
+    np.random.seed(seed)
+    plan = policy_random_given_sleeping(tasks, bedtime, duration, T, rwd_table = rwd_table)
+    plan = policy_random_optimal_disposal(tasks, plan, T, horizon = horizon, search_cycle = search_cycle, rwd_table = rwd_table)
+    return plan_rwd(plan), plan
+
+# Parallel 'policy_random_traversal': fan out the jobs of all the bedtime and sleeping duration choices to a process pool
+@instrumented
+def policy_random_traversal_parallel(tasks, T, horizon = 5, search_cycle = 5, workers = None, seed = 0, sleep_step = None, rwd_table = None, collector = None):
+    # Given:
+    #     horizon, search_cycle: same as in 'policy_random_optimal_disposal'
+    #     workers: number of worker processes, default: number of CPUs
+    #     seed: base random seed, the k-th (bedtime, duration) job uses seed + k => same result for any number of workers
+    #     T, sleep_step: time slot length, and distance between the sleeping choices (see 'sleeping_choices')
+    #     rwd_table: reward table, computed if not given; or the path of its .npy file (e.g. 'PlanStore.table_path'),
+    #                then only the path is sent to the workers, which share the memory-mapped file instead of a copy each
+    #     collector: 'Collector' of the main process only (the rwd of each job when it returns), jobs are not instrumented
+    # Return: plan with the max rwd over all the jobs (the first one if tie)
+    plan_max = {}
+    rwd_max = 0
+
+    task_names = input_analysis(tasks)
+    if rwd_table is None:
+        rwd_table = reward_table(tasks, task_names, tasks['today']['strictness'], T = T)
+
+    bedtime_list, duration_list = sleeping_choices(tasks['sleeping'], T, step = sleep_step)
+    jobs = [(bedtime, duration) for bedtime in bedtime_list for duration in duration_list]
+    n_jobs = len(jobs)
+
+    from concurrent.futures import ProcessPoolExecutor      # Imported on first use: only the parallel traversal needs it
+    with ProcessPoolExecutor(max_workers = workers) as executor:
+        results = executor.map(traversal_job, [tasks] * n_jobs, [job[0] for job in jobs], [job[1] for job in jobs], [horizon] * n_jobs, \
+                               [search_cycle] * n_jobs, [rwd_table] * n_jobs, [seed + k for k in range(n_jobs)], [T] * n_jobs)
+        for rwd, plan in results:
+            if collector is not None:
+                collector.record('policy_random_traversal_parallel.rwd', rwd)
+            if rwd > rwd_max:
+                rwd_max = rwd
+                plan_max = plan
+
+    print('Reward max: ' + str(rwd_max))
+    return plan_max
+
+# Policy traversal: for each bedtime and sleeping duration, find the plan with the max rwd by an exact solver => global optimal
+@instrumented
+def policy_traversal_all(tasks, T, rwd_table = None, solver = 'assignment', sleep_step = None, prune = True, collector = None):
+    # Given:
+    #     tasks: from input file
+    #     T: time slot length, e.g. 1/12 for 5 minutes; required, there is no global default
+    #     rwd_table: (task, slot) reward table from 'reward_table', computed if not given
+    #     solver: 'assignment': capacitated assignment ('assignment_lsa'), scales to many tasks and small T;
+    #             'dp': dynamic programming ('assignment_dp'), reference for small todolists
+    #     sleep_step: distance between the bedtime (and duration) choices, see 'sleeping_choices'; e.g. 0.5 for small T
+    #                 (default T: every choice, a few seconds at T = 1/12; 0.5: a fraction of a second, optimum over the coarser grid)
+    #     prune: skip the sleeping choices whose upper bound is not above the best rwd so far (same as in 'policy_random_traversal'),
+    #            the solver is then only called for the choices that may still win; the result is the same exact optimum
+    # Return: plan with the max rwd over all the possible plans on the discrete time slots, and its rwd
+    # Assume the sleeping rwd >= 0, so the max of plan_rwd for a sleeping choice is reached at the max total rwd of other tasks
+
+    # Extract 'strictness' info from input
+    strictness = tasks['today']['strictness']
+
+    task_names = input_analysis(tasks)
+    if rwd_table is None:
+        rwd_table = reward_table(tasks, task_names, strictness, T = T)
+    plan_max, rwd_max = traversal_exact(tasks, task_names, rwd_table, T, solver = solver, sleep_step = sleep_step, prune = prune, collector = collector)
+
+    print('Reward max: ' + str(rwd_max))
+    return plan_max, rwd_max
+
+# Exact solver of each bedtime and sleeping duration choice, return the plan with the max rwd and its rwd (same as 'policy_traversal_all')
+def traversal_exact(tasks, task_names, rwd_table, T, solver = 'assignment', sleep_step = None, prune = False, collector = None):
+    rwd_max, best = traversal_best(tasks, task_names, rwd_table, tasks['today']['strictness'], T, solver = solver, sleep_step = sleep_step, prune = prune, collector = collector)
+
+    # Only build the dict plan of the best one
+    if best is None:
+        return {}, rwd_max
+    return plan_from_assignment(tasks, best[0], best[1], rwd_table, task_names, T), rwd_max
+
+# Max rwd over all the bedtime and sleeping duration choices by an exact solver, and the best (plan, assignment, bedtime, duration)
+def traversal_best(tasks, task_names, rwd_table, strictness, T, solver = 'assignment', sleep_step = None, prune = False, collector = None):
+    # strictness: of the sleeping rwd, the same as used for rwd_table
+    # collector: 'Collector' for the time of the solver, the number of sleeping choices and the rwd of each of them
+    capacity = np.array([task_capacity(tasks[task_name], rwd_table.shape[1], T) for task_name in task_names])
+    if solver == 'dp':
+        solve = assignment_dp
+    elif solver == 'assignment':
+        solve = assignment_lsa
+    else:
+        raise Exception("Undefined solver '" + str(solver) + "' for policy_traversal_all")
+
+    rwd_max = -np.inf
+    best = None
+
+    # Sleeping rwd and awake time slots from the sleeping grid; the sleeping plan is only built for a new best choice
+    grid = sleep_grid(tasks['sleeping'], strictness, T, step = sleep_step)
+    choices = traversal_choices(grid, rwd_table, prune)
+    pruned = 0
+    for k, (bedtime, duration, bound) in enumerate(choices):
+        if bound <= rwd_max:
+            pruned = len(choices) - k
+            break
+        time_list = grid.time_list(bedtime, duration)
+        with timed(collector, solve.__name__):
+            reward, assignment = solve(rwd_table, time_list, capacity)
+        rwd = reward * grid.reward(bedtime, duration)
+        if collector is not None:
+            collector.count('sleeping_choices')
+            collector.record('traversal.rwd', rwd)
+        if rwd > rwd_max:
+            rwd_max = rwd
+            best = (grid.layout(bedtime, duration)[0], assignment, bedtime, duration)
+
+    if prune:
+        report_pruned(pruned, len(choices), collector)
+    return rwd_max, best
+
+# Batch planning for many todolists at once (e.g. of many users), with the exact solver of 'policy_traversal_all'
+@instrumented
+def policy_batch(todolists, T, solver = 'assignment', collector = None):
+    # Given:
+    #     todolists: list of dicts of tasks, each in the same format as from 'inputYAML'
+    #     solver: same as in 'policy_traversal_all'
+    # Return: list of plans with the max rwd, in the same order as todolists
+    # Reward tables are built together by 'reward_table_batch', so tasks with the same definition are only evaluated once
+    plans = []
+    with timed(collector, 'reward_table_batch'):
+        rwd_tables = reward_table_batch(todolists, T = T)
+    for tasks, rwd_table in zip(todolists, rwd_tables):
+        plan, rwd = traversal_exact(tasks, input_analysis(tasks), rwd_table, T, solver = solver, collector = collector)
+        plans.append(plan)
+    return plans
+
+# Enjoyment and productivity of a plan: its rwd with strictness = 0 and strictness = 1
+def plan_objectives(tasks, task_names, assignment, bedtime, duration, enjoyment, productivity, T):
+    # Given:
+    #     assignment, bedtime, duration: from 'traversal_best'
+    #     enjoyment, productivity: reward tables with strictness = 0 and strictness = 1
+    # Return: (enjoyment, productivity) of the plan
+    objectives = []
+    for strictness, rwd_table in [(0, enjoyment), (1, productivity)]:
+        plan, time_list = sleeping_plan(tasks, bedtime, duration, strictness, T)
+        reward = sum(rwd_table[i, n] for n, i in assignment.items() if i >= 0)
+        objectives.append(reward * plan['sleeping']['rwd'][0])
+    return tuple(objectives)
+
+# Pareto frontier of (enjoyment, productivity) points: the ones not dominated by any other point
+def pareto_frontier(points):
+    # Given: list of (enjoyment, productivity)
+    # Return: indices of the points on the frontier, in the increasing order of enjoyment
+    order = sorted(range(len(points)), key = lambda k: (-points[k][0], -points[k][1]))
+    frontier = []
+    productivity_max = -np.inf
+    for k in order:
+        if points[k][1] > productivity_max:
+            frontier.append(k)
+            productivity_max = points[k][1]
+    return frontier[::-1]
+
+# Policy strictness sweep: exact optimal plan for each strictness value, with the reward tables computed only twice
+@instrumented
+def policy_strictness_sweep(tasks, T, strictness_list = None, solver = 'assignment', sleep_step = None, collector = None):
+    # Given:
+    #     strictness_list: strictness values to plan for, 'today''s strictness in tasks is not used; default: 0, 0.1, ..., 1
+    #     solver, T, sleep_step: same as in 'policy_traversal_all'
+    # Return:
+    #     plans, rwds: plan with the max rwd and its rwd for each strictness
+    #     objectives: (enjoyment, productivity) of each plan, from 'plan_objectives'
+    #     frontier: indices in strictness_list of the plans on the enjoyment/productivity Pareto frontier
+    if strictness_list is None:
+        strictness_list = np.linspace(0, 1, 11)
+    task_names = input_analysis(tasks)
+    rwd_tables = reward_table_strictness(tasks, task_names, strictness_list, T = T)
+    enjoyment = reward_table(tasks, task_names, 0, T = T)
+    productivity = reward_table(tasks, task_names, 1, T = T)
+
+    plans, rwds, objectives = [], [], []
+    for strictness, rwd_table in zip(strictness_list, rwd_tables):
+        rwd_max, best = traversal_best(tasks, task_names, rwd_table, strictness, T, solver = solver, sleep_step = sleep_step, collector = collector)
+        if best is None:
+            raise Exception("No sleeping choice for strictness " + str(strictness))
+        plan, assignment, bedtime, duration = best
+        plans.append(plan_from_assignment(tasks, plan, assignment, rwd_table, task_names, T))
+        rwds.append(rwd_max)
+        objectives.append(plan_objectives(tasks, task_names, assignment, bedtime, duration, enjoyment, productivity, T))
+
+    frontier = pareto_frontier(objectives)
+    for k in frontier:
+        print('Strictness ' + str(round(strictness_list[k], 3)) + ': enjoyment ' + str(objectives[k][0]) + ', productivity ' + str(objectives[k][1]))
+    return plans, rwds, objectives, frontier
+
+# Policy multi-day: plan several consecutive days in one capacitated assignment over all their time slots
+@instrumented
+def policy_multiday(tasks, T, days = 7, rounds = 0, sleep_step = None, collector = None):
+    # Given:
+    #     tasks: from input file
+    #     days: number of days to plan, starting from the day after 'today'
+    #     rounds: rounds of improving the sleeping choice of each day with the others fixed (each round solves
+    #             days * number of sleeping choices joint problems); 0: keep the best sleeping choice of each day alone
+    #     T, sleep_step: same as in 'policy_traversal_all'
+    # Return: list of the plans of each day (same format as the plan of one day), and the total rwd of all the days
+    # Disposable tasks are done at most once every day; fixed-ddl and asap tasks share their capacity over all the days,
+    # so the work of a deadline in 3 days can be spread over the days before it
+    strictness = tasks['today']['strictness']
+    task_names = input_analysis(tasks)
+    tables = reward_table_days(tasks, task_names, days, strictness, T = T)
+    n_slots = tables.shape[2]
+
+    # One row for each task on each day for disposable tasks (capacity 1 every day), one row over all the days for the others
+    rows = []           # (task index, day or None for all the days)
+    for i, task_name in enumerate(task_names):
+        if task_type_of(tasks[task_name]).disposable:
+            rows.extend((i, d) for d in range(days))
+        else:
+            rows.append((i, None))
+    table = np.zeros((len(rows), days * n_slots))
+    capacity = np.zeros(len(rows), dtype = int)
+    for r, (i, d) in enumerate(rows):
+        if d is None:
+            table[r] = tables[:, i].reshape(-1)
+            capacity[r] = task_capacity(tasks[task_names[i]], days * n_slots, T)
+        else:
+            table[r, d * n_slots:(d + 1) * n_slots] = tables[d, i]
+            capacity[r] = 1
+
+    # Joint problem for given sleeping choices: rwd of each day is multiplied by its sleeping rwd
+    grid = sleep_grid(tasks['sleeping'], strictness, T, step = sleep_step)
+    sleep_plans = {}
+    def sleep_plan(bedtime, duration):
+        if (bedtime, duration) not in sleep_plans:
+            sleep_plans[(bedtime, duration)] = grid.layout(bedtime, duration)
+        return sleep_plans[(bedtime, duration)]
+
+    def solve(choices):
+        time_list = []
+        weight = np.ones(days * n_slots)
+        for d, (bedtime, duration) in enumerate(choices):
+            plan, day_time_list = sleep_plan(bedtime, duration)
+            time_list.extend(d * n_slots + n for n in day_time_list)
+            weight[d * n_slots:(d + 1) * n_slots] = plan['sleeping']['rwd'][0]
+        with timed(collector, 'multiday_assignment'):
+            return assignment_lsa(table * weight, time_list, capacity)
+
+    # Init: best sleeping choice of each day alone, with the rwd table of the day
+    choices = []
+    for d in range(days):
+        rwd_max, best = traversal_best(tasks, task_names, tables[d], strictness, T, solver = 'assignment', sleep_step = sleep_step, collector = collector)
+        if best is None:
+            raise Exception("No sleeping choice for day " + str(d))
+        choices.append((best[2], best[3]))
+    rwd_max, assignment = solve(choices)
+
+    for k in range(rounds):
+        improved = False
+        for d in range(days):
+            for choice in grid.choices():
+                choices_new = choices[:d] + [choice] + choices[d + 1:]
+                rwd, assignment_new = solve(choices_new)
+                if collector is not None:
+                    collector.record('policy_multiday.rwd', max(rwd, rwd_max))
+                if rwd > rwd_max + 1e-9:
+                    rwd_max, assignment, choices = rwd, assignment_new, choices_new
+                    improved = True
+        if not improved:
+            break
+
+    # Split the joint assignment into the plan of each day
+    plans = []
+    for d, (bedtime, duration) in enumerate(choices):
+        day_assignment = {}
+        for n in sleep_plan(bedtime, duration)[1]:
+            r = assignment[d * n_slots + n]
+            day_assignment[n] = -1 if r < 0 else rows[r][0]
+        plans.append(plan_from_assignment(tasks, sleep_plan(bedtime, duration)[0], day_assignment, tables[d], task_names, T))
+
+    print('Reward max: ' + str(rwd_max))
+    return plans, rwd_max
+
+# Policy replan: warm start from the previous plan when the clock moves on or the todolist changes
+# Time slots before 'now' are kept as they are; only the future time slots are planned again, by an exact solver,
+# with the capacity of each task reduced by what is already done. Reward rows of unchanged tasks come from 'reward_cache'.
+@instrumented
+def policy_replan(tasks, plan, T, now = 0, solver = 'assignment', sleep_step = None, rwd_table = None, collector = None):
+    # Given:
+    #     tasks: the new todolist (tasks may be added, removed or changed since the previous plan)
+    #     plan: the previous plan (dict) of the same day
+    #     now: current hour of the planned day; the time slot in progress is kept as well
+    #     solver, T, sleep_step: same as in 'policy_traversal_all'
+    #     rwd_table: (task, slot) reward table of the new todolist from 'reward_table', computed if not given
+    # Return: new plan, and its rwd
+    # Sleeping choices are limited to the ones with the same past sleeping time slots, plus the sleeping of the previous plan
+    strictness = tasks['today']['strictness']
+    task_names = input_analysis(tasks)
+    if solver == 'dp':
+        solve = assignment_dp
+    elif solver == 'assignment':
+        solve = assignment_lsa
+    else:
+        raise Exception("Undefined solver '" + str(solver) + "' for policy_replan")
+
+    # Tasks removed from the todolist are only kept in the past time slots (capacity 0 in the future)
+    tasks_all = dict(tasks)
+    for key, task in plan.items():
+        if task['name'] not in tasks_all and task['name'] not in ['sleeping', 'N/A']:
+            tasks_all[task['name']] = {'name': task['name'], 'type': key.rstrip('_')}
+    names = task_names + [task_name for task_name in tasks_all if task_name not in tasks]
+
+    old = Plan.from_dict(plan, names, T)
+    n_slots = len(old.task)
+    rwd_table_new = np.zeros((len(names), n_slots))
+    rwd_table_new[:len(task_names)] = reward_table(tasks, task_names, strictness, T = T) if rwd_table is None else rwd_table
+    rwd_table = rwd_table_new
+
+    past = np.arange(n_slots) < slot_ceil(now, T)
+    past_asleep = old.task[past] == Plan.SLEEPING
+    past_rwd = np.sum(old.rwd[past & (old.task != Plan.SLEEPING)])
+    used = np.bincount(old.task[past & (old.task >= 0)], minlength = len(names))
+    capacity = np.array([task_capacity(tasks[task_name], n_slots, T) for task_name in task_names] + [0] * (len(names) - len(task_names)))
+    capacity = np.where(capacity >= n_slots, capacity, np.maximum(capacity - used, 0))
+
+    # Candidate sleeping layouts: the previous one, and the sleeping choices that agree with the past
+    layouts = [old.copy()]
+    grid = sleep_grid(tasks['sleeping'], strictness, T, step = sleep_step)
+    for bedtime, duration in grid.choices():
+        layout = Plan.from_dict(grid.layout(bedtime, duration)[0], names, T)
+        if np.array_equal(layout.task[past] == Plan.SLEEPING, past_asleep):
+            layouts.append(layout)
+
+    rwd_max = -np.inf
+    plan_max = None
+    for layout in layouts:
+        asleep = layout.task == Plan.SLEEPING
+        if not np.any(asleep):
+            continue
+        future = list(np.flatnonzero(~past & ~asleep))
+        with timed(collector, solve.__name__):
+            reward, assignment = solve(rwd_table, future, capacity)
+        rwd = (past_rwd + reward) * layout.rwd[np.argmax(asleep)]
+        if rwd > rwd_max:
+            rwd_max = rwd
+            plan_max = layout.copy()
+            plan_max.task[past & ~asleep] = old.task[past & ~asleep]
+            plan_max.rwd[past & ~asleep] = old.rwd[past & ~asleep]
+            plan_max.task[~asleep & ~past] = Plan.NA
+            plan_max.rwd[~asleep & ~past] = 0
+            for n, i in assignment.items():
+                plan_max.assign(n, i, 0 if i < 0 else rwd_table[i, n])
+
+    if plan_max is None:
+        raise Exception("No sleeping in the plan to replan")
+    print('Reward max: ' + str(rwd_max))
+    return plan_max.to_dict(tasks_all), rwd_max
@@ -0,0 +1,163 @@
+# Portfolio of planning heuristics: several strategies and random restarts in parallel worker processes, sharing the best rwd found so far
+import io
+import random
+import time
+from contextlib import redirect_stdout
+
+import numpy as np
+
+from .inputs import input_analysis
+from .slots import sleep_grid
+from .tables import reward_table
+from .plan import plan_rwd
+from .policies import policy_random, policy_random_given_sleeping, policy_random_optimal, policy_random_optimal_disposal, policy_annealing, traversal_choices, \
+    policy_sort_disposable
+from .instrument import instrumented
+
+portfolio_strategies = ['random_optimal', 'random_optimal_disposal', 'random_traversal', 'annealing']
+
+# State of a portfolio worker process, set once by 'portfolio_init': the jobs only carry their strategy and seed
+portfolio_state = {}
+
+def portfolio_init(incumbent, tasks, rwd_table, T):
+    # incumbent: multiprocessing.Value('d') of the best rwd found so far by any job, shared by all the workers
+    portfolio_state['incumbent'] = incumbent
+    portfolio_state['tasks'] = tasks
+    portfolio_state['rwd_table'] = rwd_table
+    portfolio_state['T'] = T
+
+# Publish the rwd of a job to the shared incumbent; Return the best rwd found so far
+def incumbent_update(incumbent, rwd):
+    with incumbent.get_lock():
+        if rwd > incumbent.value:
+            incumbent.value = rwd
+        return incumbent.value
+
+# Sort a candidate plan by task capacity before its rwd is taken: only plans within the capacity of every task are scored, published and returned
+def portfolio_score(tasks, plan, T):
+    # Return: sorted plan, its rwd
+    plan = policy_sort_disposable(tasks, plan, T)
+    return plan, plan_rwd(plan)
+
+# One run of a strategy with its own random stream (run in a worker process)
+# The run stops between two rounds when the time budget is over, or when it is weak: its rwd is below 'stop_ratio' * the best rwd of all the jobs
+# ('random_traversal' skips the sleeping choices whose upper bound is not above the best rwd of all the jobs instead)
+def portfolio_job(strategy, seed_sequence, horizon, search_cycle, stop_ratio, deadline):
+    # Given:
+    #     strategy: one of 'portfolio_strategies'
+    #     seed_sequence: np.random.SeedSequence of this job, for both 'random' and 'np.random'
+    #     deadline: time.time() when the budget is over
+    # Return: rwd, plan (None if started after the deadline), and whether the run stopped early
+    tasks, rwd_table, T, incumbent = portfolio_state['tasks'], portfolio_state['rwd_table'], portfolio_state['T'], portfolio_state['incumbent']
+    if time.time() > deadline:
+        return -np.inf, None, True
+
+    state = seed_sequence.generate_state(4)
+    random.seed(int(state[0]))
+    np.random.seed(state)
+
+    stopped = False
+    with redirect_stdout(io.StringIO()):        # Policies print their progress
+        if strategy == 'random_traversal':
+            plan_max, rwd_max = None, -np.inf
+            grid = sleep_grid(tasks['sleeping'], tasks['today']['strictness'], T)
+            for bedtime, duration, bound in traversal_choices(grid, rwd_table, prune = True):
+                if time.time() > deadline or bound <= incumbent.value:
+                    stopped = True
+                    break
+                plan = policy_random_given_sleeping(tasks, bedtime, duration, T, rwd_table = rwd_table)
+                plan = policy_random_optimal_disposal(tasks, plan, T, horizon = horizon, search_cycle = search_cycle, rwd_table = rwd_table)
+                plan, rwd = portfolio_score(tasks, plan, T)
+                if rwd > rwd_max:
+                    plan_max, rwd_max = plan, rwd
+                    incumbent_update(incumbent, rwd)
+            return rwd_max, plan_max, stopped
+
+        plan = policy_random(tasks, T, rwd_table = rwd_table)
+        if strategy == 'annealing':
+            plan = policy_annealing(tasks, plan, T, time_budget = max(deadline - time.time(), 0), rwd_table = rwd_table)
+            plan, rwd = portfolio_score(tasks, plan, T)
+            incumbent_update(incumbent, rwd)
+            return rwd, plan, False
+
+        # One 'horizon' cycle per round, so the run can be stopped in between
+        policy = policy_random_optimal if strategy == 'random_optimal' else policy_random_optimal_disposal
+        for i in range(horizon):
+            plan = policy(tasks, plan, T, 1, search_cycle, rwd_table)
+            plan, rwd = portfolio_score(tasks, plan, T)
+            best = incumbent_update(incumbent, rwd)
+            if i + 1 < horizon and (time.time() > deadline or rwd < stop_ratio * best):
+                stopped = True
+                break
+    return rwd, plan, stopped
+
+# Portfolio mode: run all the strategies with random restarts in parallel, return the best plan within the wall-clock budget
+@instrumented
+def policy_portfolio(tasks, T, strategies = portfolio_strategies, restarts = 2, time_budget = 10, workers = None, seed = 0, horizon = 5, search_cycle = 7, \
+                     stop_ratio = 0.95, collector = None):
+    # Given:
+    #     tasks: from input file
+    #     strategies: list of the strategies to run, from 'portfolio_strategies':
+    #         'random_optimal', 'random_optimal_disposal': 'policy_random' then the local search, one 'horizon' cycle per round
+    #         'random_traversal': 'policy_random_traversal' over the sleeping choices in the decreasing order of their upper bound
+    #         'annealing': 'policy_random' then 'policy_annealing' for the rest of the budget
+    #     restarts: number of runs of each strategy, each with its own random stream
+    #     time_budget: wall-clock budget in seconds; the runs check 90% of it between rounds, and the runs not done at the end of it are dropped
+    #     workers: number of worker processes, default: number of CPUs
+    #     seed: the runs use independent streams spawned from np.random.SeedSequence(seed); a run is reproducible,
+    #           but where it stops early depends on the timing of the other runs
+    #     horizon, search_cycle: same as in 'policy_random_optimal_disposal'
+    #     stop_ratio: a run stops early when its rwd after a round is below stop_ratio * the best rwd found so far
+    #     collector: 'Collector' for the rwd of each run and the number of runs stopped early
+    # Return: plan with the max rwd over all the runs (the first one in the job order if tie), its rwd, and the strategy that found it;
+    #         if no run is done within the budget, a 'policy_random' plan scored on the same reward table, and the strategy 'random'
+    for strategy in strategies:
+        if strategy not in portfolio_strategies:
+            raise Exception("Undefined strategy '" + str(strategy) + "' for policy_portfolio")
+
+    task_names = input_analysis(tasks)
+    rwd_table = reward_table(tasks, task_names, tasks['today']['strictness'], T = T)
+    time_start = time.time()
+    deadline = time_start + time_budget
+    deadline_runs = time_start + 0.9 * time_budget        # Margin for the last round and the results to come back
+
+    # Restarts interleaved over the strategies: every strategy gets a worker early on
+    jobs = [strategy for k in range(restarts) for strategy in strategies]
+    seed_sequences = np.random.SeedSequence(seed).spawn(len(jobs))
+
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, wait
+    incumbent = multiprocessing.Value('d', -np.inf)
+    executor = ProcessPoolExecutor(max_workers = workers, initializer = portfolio_init, initargs = (incumbent, tasks, rwd_table, T))
+    try:
+        futures = [executor.submit(portfolio_job, jobs[k], seed_sequences[k], horizon, search_cycle, stop_ratio, deadline_runs) for k in range(len(jobs))]
+        wait(futures, timeout = max(deadline - time.time(), 0))
+    finally:
+        # Jobs not started yet are cancelled; running ones stop at their next round, without being waited for
+        executor.shutdown(wait = False, cancel_futures = True)
+
+    plan_max, rwd_max, strategy_max = None, -np.inf, None
+    stopped = 0
+    for strategy, future in zip(jobs, futures):
+        if future.cancelled() or not future.done():
+            continue
+        rwd, plan, stopped_early = future.result()
+        stopped += stopped_early
+        if plan is None:
+            continue
+        if collector is not None:
+            collector.record('policy_portfolio.' + strategy + '.rwd', rwd)
+        if rwd > rwd_max:
+            plan_max, rwd_max, strategy_max = plan, rwd, strategy
+
+    # No run done within the budget (e.g. a budget shorter than the start of the workers): a random plan rather than an empty one
+    if plan_max is None:
+        with redirect_stdout(io.StringIO()):
+            plan_max, rwd_max = portfolio_score(tasks, policy_random(tasks, T, rwd_table = rwd_table), T)
+        strategy_max = 'random'
+
+    if collector is not None:
+        collector.count('portfolio_runs', len(jobs))
+        collector.count('portfolio_stopped_early', stopped)
+    print('Reward max: ' + str(rwd_max) + ' (' + str(strategy_max) + ')')
+    return plan_max, rwd_max, strategy_max
@@ -0,0 +1,52 @@
+# Registry of the task types: what each type needs in the input file, how its reward is computed and how much of the day it can take
+# The built-in types are registered in 'rewards'; a new type is one call of 'register_task_type'
+
+# Meaning of the time x of the reward function of a type, and of the time slot n it is evaluated in
+clocks = ['day',            # x: time of the day; slot n is [n * T, (n + 1) * T]
+          'since_now',      # x: time passed since the start of the planner ('curr_time' of 'today'); slot n is shifted by it
+          'duration']       # x: duration of the task; the same reward for every time slot
+
+# One task type
+class TaskType:
+    def __init__(self, name, params, precompile, kernel, integral = None, clock = 'day', capacity = None, disposable = False, linear = True, day = None):
+        # Given:
+        #     name: value of 'type' in the input file
+        #     params: set of the required params of the type (besides 'name' and 'type'), checked by 'input_analysis'
+        #     precompile: function (task, strictness, **options) -> dict of the params of the curve, run once per task (or per stack of tasks,
+        #                 see 'stack_tasks'), so the kernel never re-derives them; must work on params given as np.ndarray
+        #     kernel: function (x, params) -> np.ndarray of the rewards at the time points x (any shape, broadcast with the params)
+        #     integral: function (a, b, params) -> np.ndarray of the integrals of the reward over [a, b]; None: numeric quadrature of the kernel
+        #     clock: one of 'clocks'
+        #     capacity: function (task) -> max hours of the task in one day; None: no limit
+        #     disposable: True: done once every day (capacity of one time slot)
+        #     linear: True if the reward is linear in 'rwd_after_strict' (see 'reward_table_strictness')
+        #     day: function (task, weekday, d) -> the task on the d-th planned day (weekday: 1-7), or None if it does not happen on that day;
+        #          None: the same task every day
+        if clock not in clocks:
+            raise Exception("Undefined clock '" + str(clock) + "' of task type '" + str(name) + "'")
+        self.name = name
+        self.params = {'name', 'type'} | set(params)
+        self.precompile = precompile
+        self.kernel = kernel
+        self.integral = integral
+        self.clock = clock
+        self.capacity = capacity
+        self.disposable = disposable
+        self.linear = linear
+        self.day = day
+        self.limited = disposable or capacity is not None
+
+task_types = {}
+
+# Register a task type (or replace the one of the same name); params: same as 'TaskType'
+def register_task_type(name, params, precompile, kernel, **options):
+    task_types[name] = TaskType(name, params, precompile, kernel, **options)
+    return task_types[name]
+
+# 'TaskType' of a task dict
+def task_type_of(task):
+    if 'type' not in task:
+        raise Exception("Task '" + str(task.get('name')) + "' does not have input 'type'")
+    if task['type'] not in task_types:
+        raise Exception("Task '" + str(task.get('name')) + "' has undefined 'type' '" + str(task['type']) + "'")
+    return task_types[task['type']]
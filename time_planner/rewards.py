@@ -0,0 +1,497 @@
+# Reward functions of all the task types, in continuous time and averaged over discrete time slots, and the registration of the built-in types
+import numpy as np
+
+from .config import procrastination
+from .registry import register_task_type, task_type_of
+
+# Combined rewards of enjoyment and productivity after weighted ratio "strictness"
+def rwd_after_strict(strictness, enjoyment, productivity):
+    # strictness ∈ [0, 1]
+    return strictness * productivity + (1 - strictness) * enjoyment
+
+# Reward function of fixed-time tasks
+def rwd_fixed_time(x, task, strictness):
+    # x: exact hour of a day, ∈ [0, 24]
+    # task.keys(): type, day, start, duration, enjoyment, productivity
+    if task["type"] == "fixed_time":
+        start = task["start"]
+        duration = task["duration"]
+        reward = rwd_after_strict(strictness, task["enjoyment"], task["productivity"])
+
+        if start <= x <= start + duration:
+            y = reward
+        else:
+            y = 0
+        return y
+    else:
+        raise Exception("Wrong reward function for non-fixed-time task")
+
+# Mathematical expression of reward function of fixed-ddl tasks
+def func_fixed_ddl(x, a, k, c):
+    # a: max reward, a > 0
+    # k: decreasing speed, ≈ half-life (?), k > 0
+    # c: start point
+    y = a + 1 - np.exp(k * (x - c))
+    return y
+
+# Find function in the expression form of func_fixed_ddl, by two points
+def findfunc_fixed_ddl(x, p1, p2):
+    # p1, p2 are start and end point on partial rwd-time function plot
+    # p1 = (x1, y1), p2 = (x2, y2)
+    # Must satisfy: x1 < x2
+    a = p1[1]
+    k = np.log(p1[1] + 1 - p2[1]) / (p2[0] - p1[0])
+    c = p1[0]
+    return func_fixed_ddl(x, a, k, c)
+
+# Reward function of fixed-ddl tasks
+def rwd_fixed_ddl(x, task, strictness):
+    # x: time duration since now
+    # task.keys(): type, approx_time, deadline, enjoyment, productivity
+    if task["type"] == "fixed_ddl":
+        approx_time = task["approx_time"]
+        deadline = task["deadline"]
+        reward = rwd_after_strict(strictness, task["enjoyment"], task["productivity"])
+
+        xdata = [0, deadline]
+        ydata = [reward, reward / 5]
+        if 0 <= x <= deadline:
+            y = findfunc_fixed_ddl(x, (xdata[0], ydata[0]), (xdata[1], ydata[1]))
+        else:
+            y = 0
+        return y
+    else:
+        raise Exception("Wrong reward function for non-fixed-ddl task")
+
+# Mathematical expression of reward function of as-soon-as-possible tasks
+def func_asap(x, a, k, c):
+    y = a * np.exp(-k * (x - c))
+    return y
+
+# Find function in the expression form of func_asap, by two points
+def findfunc_asap(x, p1, p2):
+    # p1, p2 are start and end points on rwd-time function plot
+    # p1 = (x1, y1), p2 = (x2, y2)
+    # Must satisfy: x1 < x2
+    a = p1[1]
+    k = np.log(p1[1] / p2[1]) / (p2[0] - p1[0])
+    c = p1[0]
+    return func_asap(x, a, k, c)
+
+# Reward function of asap tasks
+def rwd_asap(x, task, strictness):
+    # x: time duration since now
+    # task.keys(): type, approx_time, enjoyment, productivity
+    if task["type"] == "as_soon_as_possible":
+        approx_time = task["approx_time"]
+        reward = rwd_after_strict(strictness, task["enjoyment"], task["productivity"])
+
+        xdata = [0, approx_time * procrastination]
+        ydata = [reward, reward / 2]
+        if x >= xdata[0]:
+            y = findfunc_asap(x, (xdata[0], ydata[0]), (xdata[1], ydata[1]))
+        else:
+            y = 0
+        return y
+    else:
+        raise Exception("Wrong reward function for non-asap task")
+
+# Reward function of fun tasks
+def rwd_fun(x, task, strictness):
+    # x: whichever def (duration or exact current hour)
+    # task.keys(): type, enjoyment, productivity
+    if task["type"] == "fun":
+        reward = rwd_after_strict(strictness, task["enjoyment"], task["productivity"])
+
+        if x >= 0:
+            y = reward
+        else:
+            y = 0
+        return y
+    else:
+        raise Exception("Wrong reward function for non-fun task")
+
+# Mathematical expression of long-term tasks, dependent on the duration
+def func_long_term_duration(x, duration_max):
+    if 0 <= x <= duration_max:
+        y = 1 - np.exp(-x * 5 / duration_max)
+    else:
+        y = 0
+    return y
+
+# Mathematical expression of long-term tasks, dependent on insisted days
+def func_long_term_insist_days(insist_day, lamda):
+    # insist_day: number of days that has been insisting on working on the long-term task; must be >0
+    # lamda: dacay coefficient to reduce (a little bit) past influence, compared to the present commitment; ∈ [0, 1]
+    if np.all(np.asarray(insist_day) >= 0) and 0 <= lamda <= 1:
+        y = np.sqrt(insist_day * lamda + 1)
+        return y
+    else:
+        raise Exception("Wrong inputs for long-term task")
+
+# Reward function of long-term-beneficial tasks
+def rwd_long_term(x, task, strictness, lamda = 0.7):
+    # x: time duration of the task, accumulated after each day
+    # lamba: decay coefficient for past insisted days
+    # task.keys(): type, insist_day, duration_max, enjoyment, productivity
+    if task["type"] == "long_term":
+        insist_day = task["insist_day"]
+        duration_max = task["duration_max"]
+        reward = rwd_after_strict(strictness, task["enjoyment"], task["productivity"])
+
+        if x >= 0:
+            y = reward * func_long_term_insist_days(insist_day, lamda) * func_long_term_duration(x, duration_max)
+        else:
+            y = 0
+        return y
+    else:
+        raise Exception("Wrong reward function for non-long-term task")
+
+# Find params for the logistic signoid function for necessity task
+def findfunc_necessity(r, l, epsilon = 0.01):
+    # r: the right-boundary of x value when y = 0.99 is max (when epsilon = 0.01)
+    # l: the left-boundary of x value when y = 0.01 is min (when epsilon = 0.01)
+    # epsilon: the threshold to measure if y is close enough to 0 and 1
+
+    # Find the alpha and gamma for function logisticSigmoid((x-alpha)/gamma)
+    # <=> Solve the functions {logisticSigmoid((r-alpha)/gamma)=0.99, logisticSigmoid((l-alpha)/gamma)}
+    # <=> {(r-alpha)/gamma=ln(99)=C, (l-alpha)/gamma=-ln(99)=-C}
+    # => y(r) = y(l) = 0.5
+    C = np.log(1 - epsilon) - np.log(epsilon)
+    alpha = (r + l) / 2
+    gamma = (r - l) / (2*C)
+    return alpha, gamma
+
+# Mathematical expression for necessity task
+def func_necessity(x, time, relaxation = 1):
+    # x: exact time of the day [0, 24)
+    # time: type: list; may have param number of 0, 1, 2
+    if len(time) == 0:      # No time limit, rwd = constant, regardless of x
+        y = 1
+    elif len(time) == 1:    # Have an optimal time point, relaxation time = 2h
+        alpha1, gamma1 = findfunc_necessity(time[0], time[0] - relaxation)
+        alpha2, gamma2 = findfunc_necessity(time[0], time[0] + relaxation)
+        y = logisticSigmoid((x - alpha1) / gamma1) + logisticSigmoid((x - alpha2) / gamma2) - 1
+        # Normalization (make sure when x = time[0], y = 1)
+        y_max = logisticSigmoid((time[0] - alpha1) / gamma1) + logisticSigmoid((time[0] - alpha2) / gamma2) - 1
+        y = y / y_max
+    elif len(time) == 2:    # Have an optimal time period, relaxation time = 2h
+        alpha1, gamma1 = findfunc_necessity(time[0], time[0] - relaxation)
+        alpha2, gamma2 = findfunc_necessity(time[1], time[1] + relaxation)
+        y = logisticSigmoid((x - alpha1) / gamma1) + logisticSigmoid((x - alpha2) / gamma2) - 1
+        # Normally don't need normalization because exponential function almost always naturally makes sure during [time], y = 1
+    else:
+        raise Exception("Wrong input of 'time' for necessity task")
+    return y
+
+# Reward function of daily-necessary tasks
+def rwd_necessity(x, task, strictness):
+    # x: exact time of the day
+    # task.keys(): type, time, duration, enjoyment, productivity
+    if task["type"] == "necessity":
+        time = task["time"]
+        reward = rwd_after_strict(strictness, task["enjoyment"], task["productivity"])
+
+        if 0 <= x < 24:
+            y = reward * func_necessity(x, time)
+        else:
+            raise Exception("Wrong input time for necessity task")
+        return y
+    else:
+        raise Exception("Wrong reward function for non-necessity task")
+
+# Logistic Sigmoid Curve, for func_meal
+def logisticSigmoid(x):
+    return 1 / (1 + np.exp(-x))
+
+# Mathematical expression for reward fucntion of meals
+def func_meal(x, l, r):
+    # l, r: short for "left" and "right", lower and upper bounds for the curve
+    # 3 parts of y represents: lower bound to middle, middle to upper bound, for normalization (so y=0 when x is far away)
+    # Normalized (y_max = 1 for any x)
+    y = pow(logisticSigmoid((x - l + 1) * 3), 3) + pow(logisticSigmoid((r - x) * 3), 3) - 1
+    if y < 0:
+        y = 0
+    return y
+
+# Reward function of meals
+def rwd_meal(x, task, strictness):
+    # x: exact current time
+    # time: list type, = [start_time, end_time], end_time - start_time = 3 hours
+    # task.keys(): type, time, duration, enjoyment, productivity
+    if task["type"] == "meal":
+        time = task["time"]
+        reward = rwd_after_strict(strictness, task["enjoyment"], task["productivity"])
+        y = reward * func_meal(x, time[0], time[1]) + 0.5
+        return y
+    else:
+        raise Exception("Wrong reward function for non-meal task")
+
+# Mathematical expression for sleeping duration
+def func_sleeping_duration(x, duration_min, duration_max):
+    # Assume: duration_min <= duration_max
+    # e.g.: min = 5, max = 12
+    # the parameter 5/(max-min) makes sure when x>=max, 0.99 <= y <= 1 (saturation)
+    # x: a duration, or np.ndarray of durations (e.g. for 'SleepGrid')
+    x = np.asarray(x, dtype = float)
+    y = np.where(x >= duration_min, 1 - np.exp(-5 / (duration_max - duration_min) * (x - duration_min)), 0.)
+    return y[()]
+
+# Mathematical expression for bedtime of sleeping
+def func_sleeping_bedtime(x, bedtime_min, bedtime_max):
+    # bedtime_min: earliest time to go to bed, bedtime_max: latest time to go to bed, both ∈ [0, 24]
+    # The range may go across 0:00 (e.g.: min = 22, max = 4) or not (e.g.: min = 20, max = 23, or min = 1, max = 4)
+    # x: a time of the day, or np.ndarray of times (e.g. for 'SleepGrid')
+    # Reward decreases with the hours after bedtime_min (on the 24h circle), 0 out of the range
+    hours = np.mod(np.round(np.asarray(x, dtype = float) - bedtime_min, 9), 24)
+    y = np.where(hours <= np.mod(bedtime_max - bedtime_min, 24), np.exp(-hours), 0.)
+    return y[()]
+
+# Mathematical expression for deep sleeping cycle
+def func_sleeping_cycle(x):
+    # x: time of sleeping since bedtime, unit: hour
+    # TODO
+    pass
+
+# Reward function of sleeping
+def rwd_sleeping(x, bedtime, duration, sleeping, strictness, T):
+    # Given: dict "sleeping" from yaml file
+    # x: current real time
+    # sleeping.keys(): duration_min, duration_max, bedtime_min, bedtime_max, enjoyment, productivity
+    # Return: reward value, based on (bedtime, duration) pair, "reward" is 3D function of both bedtime and duration
+
+    # Steps:
+    # 1. check if the type is 'sleeping'
+    # 2. duration dependent function: rwd1(t_d) = reward * (1-exp(-0.8(t_d-duration_min))) (duration_min <= t_d <= duration_max)
+    # 3. bedtime dependent function: rwd2(t_b) = reward * exp(-(t_b-bedtime_min)) (bedtime_min <= t_b <= bedtime_max + 24)
+    # 4. final reward: rwd(t_d, t_b) = sqrt(rwd1(t_d)*rwd(t_b))
+    if sleeping["type"] == "sleeping":
+        duration_min = sleeping["duration_min"]
+        duration_max = sleeping["duration_max"]
+        bedtime_min = sleeping["bedtime_min"]
+        bedtime_max = sleeping["bedtime_max"]
+        reward = rwd_after_strict(strictness, sleeping["enjoyment"], sleeping["productivity"])
+        
+        rwd = reward * np.sqrt(func_sleeping_duration(duration, duration_min, duration_max) * func_sleeping_bedtime(bedtime, bedtime_min, bedtime_max))   # TODO (future work): * func_sleeping_cycle(x)
+        return rwd
+    else:
+        raise Exception("Wrong reward function for non-sleeping task")
+
+# Kernels of the task types, registered at the end of this file: params of each curve are precompiled once per task (or per stack of tasks),
+# then the kernel evaluates the rewards of a whole array of time points (see 'registry' for the meaning of each part)
+
+# Fixed-time tasks: reward during [start, start + duration]
+def compile_fixed_time(task, strictness, **options):
+    return {'reward': rwd_after_strict(strictness, task["enjoyment"], task["productivity"]), 'start': task["start"], 'end': task["start"] + task["duration"]}
+
+def kernel_fixed_time(x, params):
+    return np.where((params['start'] <= x) & (x <= params['end']), params['reward'], 0.)
+
+def integral_fixed_time(a, b, params):
+    return params['reward'] * np.maximum(np.minimum(b, params['end']) - np.maximum(a, params['start']), 0)
+
+# Fixed-ddl tasks: 'func_fixed_ddl' from reward down to reward / 5 at the deadline, same params as 'findfunc_fixed_ddl'
+def compile_fixed_ddl(task, strictness, **options):
+    reward = rwd_after_strict(strictness, task["enjoyment"], task["productivity"])
+    return {'reward': reward, 'deadline': task["deadline"], 'k': np.log(reward + 1 - reward / 5) / task["deadline"]}
+
+def kernel_fixed_ddl(x, params):
+    return np.where((0 <= x) & (x <= params['deadline']), func_fixed_ddl(x, params['reward'], params['k'], 0), 0.)
+
+def integral_fixed_ddl(a, b, params):
+    # a + 1 - exp(k * x) on [0, deadline]
+    reward, k = params['reward'], params['k']
+    lo = np.clip(a, 0, params['deadline'])
+    hi = np.clip(b, 0, params['deadline'])
+    k_safe = np.where(k > 0, k, 1)         # k = 0 only for zero reward, where the curve is constant
+    return np.where(k > 0, (reward + 1) * (hi - lo) - (np.exp(k_safe * hi) - np.exp(k_safe * lo)) / k_safe, reward * (hi - lo))
+
+# As-soon-as-possible tasks: 'func_asap', halved at approx_time * procrastination, same params as 'findfunc_asap'
+def compile_asap(task, strictness, **options):
+    return {'reward': rwd_after_strict(strictness, task["enjoyment"], task["productivity"]), 'k': np.log(2) / (task["approx_time"] * procrastination)}
+
+def kernel_asap(x, params):
+    return np.where(x >= 0, func_asap(x, params['reward'], params['k'], 0), 0.)
+
+def integral_asap(a, b, params):
+    k = params['k']
+    return params['reward'] * (np.exp(-k * np.maximum(a, 0)) - np.exp(-k * np.maximum(b, 0))) / k
+
+# Fun tasks: constant reward
+def compile_fun(task, strictness, **options):
+    return {'reward': rwd_after_strict(strictness, task["enjoyment"], task["productivity"])}
+
+def kernel_fun(x, params):
+    return np.where(x >= 0, params['reward'], 0.)
+
+def integral_fun(a, b, params):
+    return params['reward'] * (np.maximum(b, 0) - np.maximum(a, 0))
+
+# Long-term tasks: 'func_long_term_duration' of the duration, the reward already multiplied by 'func_long_term_insist_days'
+def compile_long_term(task, strictness, lamda = 0.7, **options):
+    # lamda: decay coefficient for past insisted days, same as in 'rwd_long_term'
+    reward = rwd_after_strict(strictness, task["enjoyment"], task["productivity"])
+    return {'reward': reward * func_long_term_insist_days(task["insist_day"], lamda), 'duration_max': task["duration_max"]}
+
+def kernel_long_term(x, params):
+    duration_max = params['duration_max']
+    duration_rwd = np.where((0 <= x) & (x <= duration_max), 1 - np.exp(-x * 5 / duration_max), 0.)
+    return np.where(x >= 0, params['reward'] * duration_rwd, 0.)
+
+def integral_long_term(a, b, params):
+    # 1 - exp(-5x / duration_max) on [0, duration_max]
+    duration_max = params['duration_max']
+    lo = np.clip(a, 0, duration_max)
+    hi = np.clip(b, 0, duration_max)
+    return params['reward'] * ((hi - lo) + duration_max / 5 * (np.exp(-5 * hi / duration_max) - np.exp(-5 * lo / duration_max)))
+
+def day_long_term(task, weekday, d):
+    # One more insisted day every day
+    return dict(task, insist_day = task['insist_day'] + d)
+
+# Necessity tasks: 'func_necessity', the sigmoids of 'findfunc_necessity' found once
+def compile_necessity(task, strictness, **options):
+    time = task["time"]
+    params = {'reward': rwd_after_strict(strictness, task["enjoyment"], task["productivity"]), 'points': len(time)}
+    if len(time) in [1, 2]:
+        alpha1, gamma1 = findfunc_necessity(time[0], time[0] - 1)
+        alpha2, gamma2 = findfunc_necessity(time[-1], time[-1] + 1)
+        params.update(alpha1 = alpha1, gamma1 = gamma1, alpha2 = alpha2, gamma2 = gamma2, norm = 1.)
+        if len(time) == 1:
+            # Normalization (make sure when x = time[0], y = 1)
+            params['norm'] = logisticSigmoid((time[0] - alpha1) / gamma1) + logisticSigmoid((time[0] - alpha2) / gamma2) - 1
+    elif len(time) != 0:
+        raise Exception("Wrong input of 'time' for necessity task")
+    return params
+
+def kernel_necessity(x, params):
+    if np.any((x < 0) | (x >= 24)):
+        raise Exception("Wrong input time for necessity task")
+    if params['points'] == 0:
+        y = 1
+    else:
+        y = (logisticSigmoid((x - params['alpha1']) / params['gamma1']) + logisticSigmoid((x - params['alpha2']) / params['gamma2']) - 1) / params['norm']
+    return params['reward'] * np.broadcast_to(y, x.shape)
+
+def integral_necessity(a, b, params):
+    if np.any((a < 0) | (b > 24)):
+        raise Exception("Wrong input time for necessity task")
+    if params['points'] == 0:
+        return params['reward'] * (b - a)
+    # Antiderivative of logisticSigmoid((x - alpha) / gamma): gamma * log(1 + exp((x - alpha) / gamma)), also for gamma < 0
+    alpha1, gamma1, alpha2, gamma2 = params['alpha1'], params['gamma1'], params['alpha2'], params['gamma2']
+    y = gamma1 * (np.logaddexp(0, (b - alpha1) / gamma1) - np.logaddexp(0, (a - alpha1) / gamma1)) \
+        + gamma2 * (np.logaddexp(0, (b - alpha2) / gamma2) - np.logaddexp(0, (a - alpha2) / gamma2)) - (b - a)
+    return params['reward'] * (y / params['norm'])
+
+# Meals: 'func_meal' over [time[0], time[1]], no closed-form integral (cubed sigmoids clipped at 0)
+def compile_meal(task, strictness, **options):
+    return {'reward': rwd_after_strict(strictness, task["enjoyment"], task["productivity"]), 'l': task["time"][0], 'r': task["time"][1]}
+
+def kernel_meal(x, params):
+    meal = np.power(logisticSigmoid((x - params['l'] + 1) * 3), 3) + np.power(logisticSigmoid((params['r'] - x) * 3), 3) - 1
+    return params['reward'] * np.maximum(meal, 0) + 0.5
+
+# Fixed-time tasks only happen on the days of the week in their 'day'
+def day_fixed_time(task, weekday, d):
+    return task if weekday in np.atleast_1d(task['day']) else None
+
+# Max hours of fixed-ddl and asap tasks in one day: approx_time * procrastination
+def capacity_approx_time(task):
+    return task['approx_time'] * procrastination
+
+register_task_type('fixed_time', {'day', 'start', 'duration', 'switch', 'enjoyment', 'productivity'}, compile_fixed_time, kernel_fixed_time, \
+                   integral = integral_fixed_time, day = day_fixed_time)
+register_task_type('fixed_ddl', {'approx_time', 'deadline', 'switch', 'enjoyment', 'productivity'}, compile_fixed_ddl, kernel_fixed_ddl, \
+                   integral = integral_fixed_ddl, clock = 'since_now', capacity = capacity_approx_time, linear = False)
+register_task_type('as_soon_as_possible', {'approx_time', 'switch', 'enjoyment', 'productivity'}, compile_asap, kernel_asap, \
+                   integral = integral_asap, clock = 'since_now', capacity = capacity_approx_time)
+register_task_type('fun', {'enjoyment', 'productivity'}, compile_fun, kernel_fun, integral = integral_fun, disposable = True)
+register_task_type('long_term', {'insist_day', 'duration_max', 'enjoyment', 'productivity'}, compile_long_term, kernel_long_term, \
+                   integral = integral_long_term, clock = 'duration', disposable = True, day = day_long_term)
+register_task_type('necessity', {'time', 'duration', 'enjoyment', 'productivity'}, compile_necessity, kernel_necessity, \
+                   integral = integral_necessity, disposable = True)
+register_task_type('meal', {'time', 'duration', 'enjoyment', 'productivity'}, compile_meal, kernel_meal, disposable = True)
+
+# Contineous reward value in the contineous time space, for all tasks
+def reward_contineous(x, task, strictness):
+    # x: time slot (different def for different task, see the 'clock' of its type)
+    return float(reward_contineous_array(x, task, strictness))
+
+# Discrete reward (enjoyment & productivity) value over time period T, based on reward functinos in continuous time for all tasks
+def reward_discrete(n, task, strictness, T, detailed = True):
+    # Given: 
+        # n: discrete number of T; have different meaning for different type of task
+        # task: a dict, different "type" has different (contineous) reward function, all registered in 'task_types'
+    # Return: average reward during time period / time sampling window [n * T, (n + 1) * T] over certain detailed time length
+    #         (e.g. each minute, or simple average of two ends, or 'exact'), same as 'reward_discrete_array' of one n
+    return float(reward_discrete_array(n, task, strictness, T, detailed = detailed))
+
+# Contineous reward values of one task over an array of time points, by the kernel of its type
+def reward_contineous_array(x, task, strictness, lamda = 0.7):
+    # x: np.ndarray of time points (same def as in 'reward_contineous' for each task type)
+    # lamda: decay coefficient for past insisted days of long-term tasks, same as in 'rwd_long_term'
+    # Return: np.ndarray of reward values with the same shape as x
+    task_type = task_type_of(task)
+    return task_type.kernel(np.asarray(x, dtype = float), task_type.precompile(task, strictness, lamda = lamda))
+
+# Gauss-Legendre nodes and weights on [-1, 1], by number of nodes, for the numeric integration of types without a closed-form integral
+quadrature_nodes = {}
+
+# Integral of a precompiled reward curve over [a, b]: closed form of the type, or Gauss-Legendre quadrature of its kernel
+def kernel_integral(task_type, params, a, b, nodes = 16):
+    # a, b: np.ndarray with a trailing axis of length 1 (the quadrature nodes are laid along it)
+    if task_type.integral is not None:
+        return task_type.integral(a, b, params)
+    if nodes not in quadrature_nodes:
+        quadrature_nodes[nodes] = np.polynomial.legendre.leggauss(nodes)
+    x, w = quadrature_nodes[nodes]
+    values = task_type.kernel(a + (b - a) * (x + 1) / 2, params)
+    return np.sum(values * w, axis = -1, keepdims = True) * (b - a) / 2
+
+# Exact integral of the contineous reward of one task over [a, b], vectorized, from the antiderivatives of the reward functions
+# Meal tasks (cubed sigmoids clipped at 0) have no simple antiderivative and fall back to Gauss-Legendre quadrature
+def reward_integral_array(a, b, task, strictness, lamda = 0.7, nodes = 16):
+    # Given:
+    #     a, b: np.ndarray of the bounds of the intervals (same def of time as in 'reward_contineous' for each task type), a <= b,
+    #           with a trailing axis of length 1 (the quadrature nodes are laid along it)
+    #     nodes: number of Gauss-Legendre nodes for the numeric fallback
+    # Return: np.ndarray of the integrals, broadcast shape of a, b and the task params
+    task_type = task_type_of(task)
+    params = task_type.precompile(task, strictness, lamda = lamda)
+    return kernel_integral(task_type, params, np.asarray(a, dtype = float), np.asarray(b, dtype = float), nodes)
+
+# Discrete reward over time periods [n * T, (n + 1) * T] for an array of n, vectorized version of 'reward_discrete'
+# The params of the task are precompiled once for all the time periods
+def reward_discrete_array(n, task, strictness, T, detailed = True, wrap = True):
+    # n: np.ndarray of discrete numbers of T
+    # detailed: True: average over minutes; False: average of two ends; 'exact': exact average by 'reward_integral_array'
+    # wrap: True: time of the day (mod 24); False: time since now over several days, e.g. for cross-day deadlines
+    # Return: np.ndarray of average rewards, one for each n
+    task_type = task_type_of(task)
+    params = task_type.precompile(task, strictness)
+
+    if detailed == 'exact':
+        # Trailing axis of length 1 in place of the sampling axis, so the params of stacked tasks broadcast the same way
+        a = (np.asarray(n, dtype = float) * T)[..., None]
+        if wrap:
+            # A period crossing 24:00 is split into the end of the day and the beginning of the day
+            a = np.mod(a, 24)
+            b = a + T
+            rwd = kernel_integral(task_type, params, a, np.minimum(b, 24)) + kernel_integral(task_type, params, 0 * a, np.maximum(b - 24, 0))
+        else:
+            rwd = kernel_integral(task_type, params, a, a + T)
+        return rwd[..., 0] / T
+
+    if detailed:
+        # Average over minutes
+        count = int(np.floor(T * 60 + 1))
+    else:
+        # Average of two ends of the [nT, (n+1)T]
+        count = 2
+
+    n = np.asarray(n, dtype = float)
+    delta = np.linspace(n * T, (n + 1) * T, count, axis = -1)
+    if wrap:
+        delta = np.mod(delta, 24)
+    return np.mean(task_type.kernel(delta, params), axis = -1)
@@ -0,0 +1,249 @@
+# Local planning service: asyncio HTTP server (TCP or Unix socket) with warm todolists and reward tables, and a worker pool for the policies
+import io
+import json
+import os
+import time
+from collections import deque
+from contextlib import redirect_stdout
+
+import numpy as np
+
+from .inputs import input_analysis
+from .cache import RewardCache
+from .tables import reward_table
+from .plan import plan_rwd
+from .policies import policy_random, policy_annealing, policy_traversal_all, policy_replan
+from .store import todolist_hash
+
+# JSON of numpy values in plans and stats: arrays as lists, scalars as numbers
+def json_default(value):
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return float(value)
+
+# One policy run in a worker process: CPU-bound, so it never runs on the event loop
+def service_job(policy, tasks, rwd_table, params):
+    # Given:
+    #     policy: 'traversal' ('policy_traversal_all'), 'annealing' ('policy_random' then 'policy_annealing') or 'replan' ('policy_replan')
+    #     rwd_table: warm reward table of the todolist from the service
+    #     params: dict of the params of the policy, with 'T'
+    # Return: plan and its rwd
+    T = params['T']
+    with redirect_stdout(io.StringIO()):        # Policies print their progress
+        if policy == 'traversal':
+            plan, rwd = policy_traversal_all(tasks, T, rwd_table = rwd_table, solver = params['solver'], sleep_step = params['sleep_step'], prune = params['prune'])
+        elif policy == 'annealing':
+            plan = policy_random(tasks, T, rwd_table = rwd_table)
+            plan = policy_annealing(tasks, plan, T, iterations = params['iterations'], time_budget = params['time_budget'], rwd_table = rwd_table)
+            rwd = plan_rwd(plan)
+        elif policy == 'replan':
+            plan, rwd = policy_replan(tasks, params['plan'], T, now = params['now'], solver = params['solver'], sleep_step = params['sleep_step'], rwd_table = rwd_table)
+        else:
+            raise Exception("Undefined policy '" + str(policy) + "' for the planning service")
+    return plan, float(rwd)
+
+# Planning service state: todolists and reward tables stay in memory between requests; policies run in a process pool
+# Requests (HTTP/1.1, JSON body, one request per connection):
+#     POST /todolist  {"id", "tasks": {...} or "yaml": "..."}: parse, check and warm up the reward table
+#     POST /plan      {"id", "policy": "traversal" | "annealing", "budget": seconds, ...}: plan, and keep the plan for replanning
+#     POST /replan    {"id", "now": hour, "tasks" (optional, the changed todolist), "budget"}: warm start from the last plan
+#     GET  /stats     queue depth, requests in flight, counters and latency percentiles
+class PlanningService:
+    def __init__(self, T, workers = None, max_pending = 32, budget = 10, solver = 'assignment', sleep_step = None, max_tables = 256):
+        # Given:
+        #     workers: number of worker processes, default: number of CPUs
+        #     max_pending: max number of plan/replan requests queued or running; more are rejected at once (503) => backpressure
+        #     budget: default time budget of a request in seconds (queueing included); late requests get 504
+        #     T, solver, sleep_step: same as in 'policy_traversal_all', for all the requests
+        #     max_tables: max number of warm reward tables, least recently used ones are dropped
+        # Spawned (not forked) workers: the event loop already runs threads (e.g. for 'getaddrinfo') and listening sockets,
+        # a forked worker could inherit a held lock or keep the port open
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.executor = ProcessPoolExecutor(max_workers = self.workers, mp_context = multiprocessing.get_context('spawn'))
+        self.max_pending = max_pending
+        self.budget = budget
+        self.T = T
+        self.solver = solver
+        self.sleep_step = sleep_step
+
+        self.todolists = {}         # id -> (tasks, table key)
+        self.tables = RewardCache(max_tables)
+        self.plans = {}             # id -> last plan
+        self.slots = None           # asyncio.Semaphore of the workers, created in the event loop
+        self.queued = 0
+        self.running = 0
+        self.counters = {'completed': 0, 'rejected': 0, 'timeouts': 0, 'errors': 0}
+        self.latencies = deque(maxlen = 1000)       # Seconds of the last plan/replan requests
+
+    # Register (or update) a todolist and its warm reward table
+    def add_todolist(self, todolist_id, tasks):
+        task_names = input_analysis(tasks)
+        strictness = tasks['today']['strictness']
+        key = todolist_hash(tasks, self.T, strictness = strictness, kind = 'reward_table')
+        self.tables.get(key, lambda: reward_table(tasks, task_names, strictness, T = self.T))
+        self.todolists[todolist_id] = (tasks, key)
+        return key
+
+    def table(self, todolist_id):
+        tasks, key = self.todolists[todolist_id]
+        return self.tables.get(key, lambda: reward_table(tasks, input_analysis(tasks), tasks['today']['strictness'], T = self.T))
+
+    # Run a job in the worker pool within the time budget (waiting for a free worker included)
+    async def run(self, budget, *args):
+        import asyncio          # Imported on first use, as the process pool: 'import time_planner' stays light
+        if self.queued + self.running >= self.max_pending:
+            self.counters['rejected'] += 1
+            return 503, {'error': 'Too many pending requests, retry later'}
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + budget
+        self.queued += 1
+        try:
+            await asyncio.wait_for(self.slots.acquire(), budget)
+        except asyncio.TimeoutError:
+            self.counters['timeouts'] += 1
+            return 504, {'error': 'Time budget exceeded while queued'}
+        finally:
+            self.queued -= 1
+
+        # The worker is only free again when the job is done, even if the request has given up on it
+        self.running += 1
+        future = loop.run_in_executor(self.executor, service_job, *args)
+        def release(future):
+            self.running -= 1
+            self.slots.release()
+        future.add_done_callback(release)
+        try:
+            plan, rwd = await asyncio.wait_for(asyncio.shield(future), max(deadline - loop.time(), 0))
+        except asyncio.TimeoutError:
+            self.counters['timeouts'] += 1
+            return 504, {'error': 'Time budget exceeded'}
+        return 200, {'plan': plan, 'rwd': rwd}
+
+    async def plan(self, body):
+        todolist_id = body.get('id', 'default')
+        if 'tasks' in body or 'yaml' in body:
+            self.add_todolist(todolist_id, self.parse_tasks(body))
+        if todolist_id not in self.todolists:
+            return 404, {'error': "Unknown todolist '" + str(todolist_id) + "'"}
+        budget = float(body.get('budget', self.budget))
+        params = {'T': self.T, 'solver': body.get('solver', self.solver), 'sleep_step': self.sleep_step, 'prune': body.get('prune', True),
+                  'iterations': int(body.get('iterations', 20000)), 'time_budget': 0.8 * budget}
+        status, content = await self.run(budget, body.get('policy', 'traversal'), self.todolists[todolist_id][0], self.table(todolist_id), params)
+        if status == 200:
+            self.plans[todolist_id] = content['plan']
+        return status, content
+
+    async def replan(self, body):
+        todolist_id = body.get('id', 'default')
+        if todolist_id not in self.plans:
+            return 404, {'error': "No plan to replan for todolist '" + str(todolist_id) + "'"}
+        if 'tasks' in body or 'yaml' in body:
+            self.add_todolist(todolist_id, self.parse_tasks(body))
+        params = {'T': self.T, 'solver': body.get('solver', self.solver), 'sleep_step': self.sleep_step,
+                  'plan': self.plans[todolist_id], 'now': float(body.get('now', 0))}
+        status, content = await self.run(float(body.get('budget', self.budget)), 'replan', self.todolists[todolist_id][0], self.table(todolist_id), params)
+        if status == 200:
+            self.plans[todolist_id] = content['plan']
+        return status, content
+
+    # Todolist from the request: a dict of tasks, or the YAML text of a todolist file
+    def parse_tasks(self, body):
+        if 'tasks' in body:
+            return body['tasks']
+        import yaml
+        return yaml.safe_load(body['yaml'])
+
+    def stats(self):
+        latencies = np.array(self.latencies) * 1000
+        percentiles = {}
+        if len(latencies) > 0:
+            percentiles = {'p50': np.percentile(latencies, 50), 'p90': np.percentile(latencies, 90), 'p99': np.percentile(latencies, 99), 'max': np.max(latencies)}
+        return {'queue_depth': self.queued, 'running': self.running, 'workers': self.workers, 'max_pending': self.max_pending,
+                'todolists': len(self.todolists), 'tables': self.tables.info(), 'counters': self.counters, 'latency_ms': percentiles}
+
+    async def dispatch(self, method, target, body):
+        if method == 'GET' and target == '/stats':
+            return 200, self.stats()
+        if method == 'POST' and target == '/todolist':
+            return 200, {'id': body.get('id', 'default'), 'key': self.add_todolist(body.get('id', 'default'), self.parse_tasks(body))}
+        if method == 'POST' and target in ['/plan', '/replan']:
+            start = time.perf_counter()
+            status, content = await (self.plan(body) if target == '/plan' else self.replan(body))
+            if status == 200:
+                self.counters['completed'] += 1
+                self.latencies.append(time.perf_counter() - start)
+            return status, content
+        return 404, {'error': 'Unknown request ' + method + ' ' + target}
+
+    # One HTTP request per connection
+    async def handle(self, reader, writer):
+        try:
+            request_line = (await reader.readline()).decode('latin-1').split()
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in [b'\r\n', b'\n', b'']:
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            length = int(headers.get('content-length', 0))
+            body = json.loads(await reader.readexactly(length)) if length > 0 else {}
+            status, content = await self.dispatch(request_line[0], request_line[1], body)
+            payload = json.dumps(content, default = json_default).encode('utf-8')
+        except Exception as e:
+            self.counters['errors'] += 1
+            status = 400
+            payload = json.dumps({'error': str(e)}).encode('utf-8')
+
+        reason = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 503: 'Service Unavailable', 504: 'Gateway Timeout'}[status]
+        writer.write(('HTTP/1.1 ' + str(status) + ' ' + reason + '\r\nContent-Type: application/json\r\nContent-Length: ' + str(len(payload)) + \
+                      '\r\nConnection: close\r\n\r\n').encode('latin-1') + payload)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    # Start listening on a TCP port, or on a Unix socket if 'path' is given; Return the asyncio server
+    async def start(self, host = '127.0.0.1', port = 8765, path = None):
+        import asyncio
+        self.slots = asyncio.Semaphore(self.workers)
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle, path)
+        return await asyncio.start_server(self.handle, host, port)
+
+    def close(self):
+        self.executor.shutdown(wait = False, cancel_futures = True)
+
+# Run the planning service until interrupted, e.g. serve(port = 8765) or serve(path = '/tmp/planner.sock')
+def serve(host = '127.0.0.1', port = 8765, path = None, **params):
+    # params: of 'PlanningService'
+    import asyncio
+    async def main():
+        service = PlanningService(**params)
+        server = await service.start(host, port, path)
+        print('Planning service on ' + (path if path is not None else host + ':' + str(port)))
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            service.close()
+    asyncio.run(main())
+
+# Client of the planning service: one request, Return (status, JSON content)
+async def service_request(method, target, body = None, host = '127.0.0.1', port = 8765, path = None):
+    import asyncio
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    payload = json.dumps(body if body is not None else {}, default = json_default).encode('utf-8')
+    writer.write((method + ' ' + target + ' HTTP/1.1\r\nHost: ' + host + '\r\nContent-Type: application/json\r\nContent-Length: ' + str(len(payload)) + \
+                  '\r\nConnection: close\r\n\r\n').encode('latin-1') + payload)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, content = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(content)
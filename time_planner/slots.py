@@ -0,0 +1,141 @@
+# Discrete time slots of a day: slot counting, sleeping choices and task capacities
+import numpy as np
+
+from .rewards import rwd_after_strict, func_sleeping_duration, func_sleeping_bedtime
+from .cache import task_fingerprint, reward_cache, rwd_sleeping_cached
+from .registry import task_type_of
+
+# Number of the time slots [n * T, (n + 1) * T] before time x, rounded down or up
+# x / T is rounded first, so that e.g. 2 / (1/12) is exactly 24 slots instead of 25 after the float error
+def slot_floor(x, T):
+    return int(np.floor(np.round(x / T, 9)))
+
+def slot_ceil(x, T):
+    return int(np.ceil(np.round(x / T, 9)))
+
+# Given inputs, Return potential possible bedtime and duration choices (in a discrete form)
+def sleeping_choices(sleeping, T, step = None):
+    # bedtime_min, bedtime_max ∈ [0, 24]: the range may go across 0:00 (e.g. 22-4), or not (e.g. 20-23, or 1-4)
+    # 'bedtime_list', 'duration_list': discrete choice list for 'bedtime' and 'duration', on the boundaries of the time slots
+    #     bedtime in a range across 0:00 is negative before 0:00 (e.g. -2 for 22:00), see 'sleeping_plan' for the layout
+    # step: distance between two choices, a multiple of T (default: T); e.g. 0.5 for T = 1/12 gives 144 times fewer choices
+    if step is None:
+        step = T
+    elif not np.isclose(step / T, np.round(step / T)):
+        raise Exception("Sleeping choice step " + str(step) + " is not a multiple of T")
+    bedtime_min = sleeping['bedtime_min']
+    bedtime_range = np.mod(sleeping['bedtime_max'] - bedtime_min, 24)
+    if bedtime_min + bedtime_range >= 24:
+        bedtime_min = bedtime_min - 24
+    bedtime_list = np.arange(slot_ceil(bedtime_min, step), slot_floor(bedtime_min + bedtime_range, step) + 1) * step
+    duration_list = np.arange(slot_ceil(sleeping['duration_min'], step), slot_floor(sleeping['duration_max'], step) + 1) * step
+    return bedtime_list, duration_list
+
+# Plan of sleeping from the time of the day it starts, and the time slots left for other tasks
+def sleeping_layout(start, duration, rwd, T):
+    # Given: start ∈ [0, 24), duration: sleeping time; rwd: sleeping rwd of the choice
+    # Return: same as 'sleeping_plan'
+    plan = {}
+    end = start + duration
+    if np.round(end, 9) > 24:
+        # Sleep before 24:00 and get up the next morning: asleep at both ends of the day
+        plan['sleeping'] = {'name': 'sleeping', 'time': [0, end - 24], 'rwd': [rwd] * slot_ceil(end - 24, T)}
+        plan['sleeping_'] = {'name': 'sleeping', 'time': [start, 24], 'rwd': [rwd] * slot_ceil(24 - start, T)}
+        time_list = list(range(slot_ceil(end - 24, T), slot_floor(start, T)))
+    else:
+        plan['sleeping'] = {'name': 'sleeping', 'time': [start, end], 'rwd': [rwd] * slot_ceil(duration, T)}
+        # Awake after getting up until 24:00, then the extra time before going to sleep
+        time_list = list(range(slot_ceil(end, T), slot_floor(24, T)))
+        time_list.extend(range(0, slot_floor(start, T)))
+    return plan, time_list
+
+# Plan of sleeping for the given bedtime and duration, and the time slots left for other tasks
+def sleeping_plan(tasks, bedtime, duration, strictness, T):
+    # Given: bedtime, duration: one choice from 'sleeping_choices'
+    # Return:
+    #     plan: only with sleeping in it (same as in 'policy_random_given_sleeping')
+    #     time_list: discrete numbers n of all the awake time slots [n * T, (n + 1) * T], from the getup time on
+    # The sleeping rwd only depends on (bedtime, duration): the same for all the sleeping time slots
+    start = np.mod(bedtime, 24)
+    return sleeping_layout(start, duration, rwd_sleeping_cached(start, start, duration, tasks['sleeping'], strictness, T), T)
+
+# Sleeping rwd and awake time slots of all the (bedtime, duration) choices, computed once as arrays over the choice grid
+# Use 'sleep_grid' to share one grid per sleeping task, strictness, T and step through 'reward_cache'
+class SleepGrid:
+    def __init__(self, sleeping, strictness, T, step = None):
+        self.sleeping = sleeping
+        self.strictness = strictness
+        self.T = T
+        self.step = T if step is None else step
+        self.bedtime_list, self.duration_list = sleeping_choices(sleeping, T, step = step)
+
+        # Sleeping rwd surface, bedtime × duration, same as 'rwd_sleeping' of every choice
+        reward = rwd_after_strict(strictness, sleeping['enjoyment'], sleeping['productivity'])
+        bedtime_rwd = func_sleeping_bedtime(np.mod(self.bedtime_list, 24), sleeping['bedtime_min'], sleeping['bedtime_max'])
+        duration_rwd = func_sleeping_duration(self.duration_list, sleeping['duration_min'], sleeping['duration_max'])
+        self.rwd = reward * np.sqrt(bedtime_rwd[:, None] * duration_rwd[None, :])
+
+        # Awake time slots of every choice: 'n_awake' slots from the getup slot on, around 24:00 if needed (same as 'sleeping_layout')
+        n_slots = slot_floor(24, T)
+        start = np.floor(np.round(np.mod(self.bedtime_list, 24) / T, 9)).astype(int)[:, None]
+        end = np.ceil(np.round((np.mod(self.bedtime_list, 24)[:, None] + self.duration_list[None, :]) / T, 9)).astype(int)
+        self.getup_slot = np.mod(end, n_slots)
+        self.n_awake = n_slots - (end - start)
+        self.n_slots = n_slots
+
+    # Indices (i, j) of a choice in 'bedtime_list' and 'duration_list', O(1); bedtime may also be given as the time of the day
+    def index(self, bedtime, duration):
+        # Plain float arithmetic: numpy scalar functions would cost more than the lookup itself
+        i = int(round(((bedtime - self.bedtime_list[0]) % 24) / self.step))
+        j = int(round((duration - self.duration_list[0]) / self.step))
+        if not (0 <= i < len(self.bedtime_list) and abs((self.bedtime_list[i] - bedtime + 12) % 24 - 12) < 1e-9):
+            raise Exception("Bedtime " + str(bedtime) + " is not one of the sleeping choices")
+        if not (0 <= j < len(self.duration_list) and abs(self.duration_list[j] - duration) < 1e-9):
+            raise Exception("Duration " + str(duration) + " is not one of the sleeping choices")
+        return i, j
+
+    # All the choices (bedtime, duration), in the order of the traversals
+    def choices(self):
+        return [(bedtime, duration) for bedtime in self.bedtime_list for duration in self.duration_list]
+
+    # Sleeping rwd of a choice, O(1)
+    def reward(self, bedtime, duration):
+        i, j = self.index(bedtime, duration)
+        return self.rwd[i, j]
+
+    # Awake time slots of a choice, from the getup time on (same as 'sleeping_plan')
+    def time_list(self, bedtime, duration):
+        i, j = self.index(bedtime, duration)
+        return np.mod(self.getup_slot[i, j] + np.arange(self.n_awake[i, j]), self.n_slots).tolist()
+
+    # Upper bound of plan_rwd of every choice, for pruning: sleeping rwd × sum of the max positive rwd of each awake time slot
+    def bounds(self, rwd_table):
+        # rwd_table: (task, slot) reward table from 'reward_table'
+        # Return: np.ndarray of shape (len(bedtime_list), len(duration_list))
+        slot_max = np.maximum(np.max(rwd_table, axis = 0, initial = 0), 0)
+        # Sums over the awake time slots (around 24:00 if needed) by the prefix sums of two days
+        cumsum = np.concatenate([[0], np.cumsum(np.tile(slot_max, 2))])
+        return self.rwd * (cumsum[self.getup_slot + self.n_awake] - cumsum[self.getup_slot])
+
+    # Plan with only sleeping in it and the awake time slots of a choice (same as 'sleeping_plan', with the rwd from the grid)
+    def layout(self, bedtime, duration):
+        i, j = self.index(bedtime, duration)
+        return sleeping_layout(np.mod(self.bedtime_list[i], 24), self.duration_list[j], self.rwd[i, j], self.T)
+
+# Cached 'SleepGrid' of a sleeping task
+def sleep_grid(sleeping, strictness, T, step = None):
+    key = ('sleep_grid', task_fingerprint(sleeping), strictness, T, step)
+    return reward_cache.get(key, lambda: SleepGrid(sleeping, strictness, T, step = step))
+
+# Max number of time slots [n * T, (n + 1) * T] a task can take in one day
+def task_capacity(task, n_slots, T):
+    # n_slots: number of time slots in the day (no limit for types without a capacity rule, e.g. fixed-time tasks)
+    # Disposable tasks ('fun', 'necessity', 'meal', 'long_term'): only once every day
+    # Limited tasks ('fixed_ddl', 'as_soon_as_possible'): no more than the hours of the 'capacity' of their type (approx_time * procrastination)
+    task_type = task_type_of(task)
+    if task_type.disposable:
+        return 1
+    elif task_type.capacity is not None:
+        return min(slot_ceil(task_type.capacity(task), T), n_slots)
+    else:
+        return n_slots
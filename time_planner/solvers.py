@@ -0,0 +1,129 @@
+# Exact solvers of the (task, slot) assignment for a given sleeping choice
+import numpy as np
+
+from .plan import Plan
+
+# Add tasks into the plan by a given assignment of time slots
+def plan_from_assignment(tasks, plan, assignment, rwd_table, task_names, T):
+    # Given:
+    #     plan: plan to add the tasks to, e.g. from 'sleeping_plan'
+    #     assignment: dict of {n: index of the task in task_names (-1 for N/A)} for time slots [n * T, (n + 1) * T]
+    #     rwd_table: (task, slot) reward table, rows in the order of task_names
+    # Return: new plan in the time order
+    newplan = Plan.from_dict(plan, task_names, T)
+    for n, i in assignment.items():
+        newplan.assign(n, i, 0 if i < 0 else rwd_table[i, n])
+
+    return newplan.to_dict(tasks)
+
+# Baseline of each time slot and the gains of limited tasks over it, shared by the exact solvers
+def assignment_baseline(table, capacity):
+    # Given:
+    #     table: (task, slot) reward table of the time slots to assign
+    #     capacity: np.ndarray, max number of time slots of each task, from 'task_capacity'
+    # Return:
+    #     base_index, base: best task without limit (-1 for N/A) and its rwd (>= 0) in each time slot
+    #     limited, gain, cap: index, gain over the baseline in each time slot and capacity of the limited tasks worth planning
+    n_slots = table.shape[1]
+
+    # Tasks without limit (and N/A) never use up any capacity: the best of them is the baseline of each time slot
+    unlimited = capacity >= n_slots
+    base_index = -np.ones(n_slots, dtype = int)
+    base = np.zeros(n_slots)
+    if np.any(unlimited):
+        unlimited_index = np.flatnonzero(unlimited)
+        best = np.argmax(table[unlimited_index], axis = 0)
+        best_rwd = table[unlimited_index[best], np.arange(n_slots)]
+        base_index = np.where(best_rwd > 0, unlimited_index[best], -1)
+        base = np.maximum(best_rwd, 0)
+
+    # A limited task is only worth its capacity where it is better than the baseline
+    limited = np.flatnonzero(~unlimited)
+    gain = table[limited] - base
+    cap = np.minimum(capacity[limited], np.sum(gain > 0, axis = 1))
+    limited, gain, cap = limited[cap > 0], gain[cap > 0], cap[cap > 0]
+
+    return base_index, base, limited, gain, cap
+
+# Max number of states of the dense DP table of 'assignment_dp', above it the instance is solved by 'assignment_lsa'
+dp_max_states = 10 ** 6
+
+# Exact dynamic programming over the time slots: max total reward subject to the capacity of each task
+# Reference solver for small todolists: the number of states grows with the product of the capacities
+def assignment_dp(rwd_table, time_list, capacity, max_states = dp_max_states):
+    # Given:
+    #     rwd_table: (task, slot) reward table
+    #     time_list: time slots to assign (columns of rwd_table)
+    #     capacity: np.ndarray, max number of time slots of each task, from 'task_capacity'
+    #     max_states: max number of DP states; a larger instance falls back to 'assignment_lsa' (same optimum) instead of running out of memory
+    # Return: max total reward, and assignment dict of {n: task index (-1 for N/A)}
+    # DP state: number of time slots used by each limited task => exact, but the number of states grows with the product of the capacities
+    time_list = list(time_list)
+    table = rwd_table[:, time_list]
+    n_slots = len(time_list)
+
+    base_index, base, limited, gain, cap = assignment_baseline(table, capacity)
+    if np.prod(cap + 1., dtype = float) > max_states:         # Float product: no integer overflow for many tasks
+        return assignment_lsa(rwd_table, time_list, capacity)
+
+    # Dense DP table over all the states, -inf for the unreachable ones
+    shape = tuple(cap + 1)
+    value = np.full(shape, -np.inf)
+    value[(0,) * len(limited)] = 0
+    history = []
+    for j in range(n_slots):
+        value_new = value.copy()
+        choice = -np.ones(shape, dtype = int)     # -1: baseline, no capacity used
+        for k in np.flatnonzero(gain[:, j] > 0):
+            # Do limited task k in time slot j: from state (.., c_k, ..) to (.., c_k + 1, ..)
+            src = [slice(None)] * len(limited)
+            dst = [slice(None)] * len(limited)
+            src[k] = slice(0, cap[k])
+            dst[k] = slice(1, cap[k] + 1)
+            shifted = np.full(shape, -np.inf)
+            shifted[tuple(dst)] = value[tuple(src)] + gain[k, j]
+            better = shifted > value_new
+            value_new[better] = shifted[better]
+            choice[better] = k
+        history.append(choice)
+        value = value_new
+
+    # Backtrack the assignment from the best final state
+    state = list(np.unravel_index(np.argmax(value), shape))
+    reward = np.sum(base) + np.max(value)
+    assignment = {}
+    for j in range(n_slots - 1, -1, -1):
+        k = history[j][tuple(state)]
+        if k < 0:
+            assignment[time_list[j]] = base_index[j]
+        else:
+            assignment[time_list[j]] = limited[k]
+            state[k] -= 1
+
+    return reward, assignment
+
+# Capacitated assignment of the time slots to the tasks, solved as a rectangular linear sum assignment => exact, polynomial time
+def assignment_lsa(rwd_table, time_list, capacity):
+    # Given: same as 'assignment_dp'
+    # Return: max total reward, and assignment dict of {n: task index (-1 for N/A)}
+    # Each limited task is split into 'cap' identical columns with capacity 1; the gains are clipped at 0 so that
+    # the complete matching never loses rwd, and a time slot matched with no gain keeps its baseline
+    from scipy.optimize import linear_sum_assignment      # Imported on first use: scipy.optimize is slow to import
+    time_list = list(time_list)
+    table = rwd_table[:, time_list]
+    base_index, base, limited, gain, cap = assignment_baseline(table, capacity)
+
+    columns = np.repeat(np.arange(len(limited)), cap)
+    weight = np.maximum(gain[columns], 0)
+    cols, rows = linear_sum_assignment(weight, maximize = True)
+
+    assignment = {}
+    for j in range(len(time_list)):
+        assignment[time_list[j]] = base_index[j]
+    reward = np.sum(base)
+    for col, j in zip(cols, rows):
+        if weight[col, j] > 0:
+            assignment[time_list[j]] = limited[columns[col]]
+            reward += weight[col, j]
+
+    return reward, assignment
@@ -0,0 +1,93 @@
+# Persistent on-disk cache of reward tables (memory-mapped .npy files) and best plans (JSON), keyed by a content hash of the todolist
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from .inputs import input_analysis
+from .tables import reward_table
+from .policies import policy_traversal_all
+
+# Content hash of a todolist and the planning params: the same for the same YAML content, in any key order
+def todolist_hash(tasks, T, strictness = None, **params):
+    # Given:
+    #     tasks: dict of tasks, e.g. from 'inputYAML'
+    #     strictness: default: 'today''s strictness
+    #     params: other params the cached value depends on, e.g. detailed = True, solver = 'assignment'
+    # Return: hex string, used as the file name in 'PlanStore'
+    if strictness is None:
+        strictness = tasks['today']['strictness']
+    content = {'version': 1, 'tasks': tasks, 'T': float(T), 'strictness': float(strictness), 'params': params}
+    text = json.dumps(content, sort_keys = True, default = float)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:32]
+
+# Directory of cached reward tables and plans, shared by repeated runs and by worker processes
+# Files are written once under a temporary name and renamed, so a reader never sees a partial file
+class PlanStore:
+    def __init__(self, directory = 'planner_cache'):
+        self.directory = directory
+        os.makedirs(directory, exist_ok = True)
+
+    def path(self, key, extension):
+        return os.path.join(self.directory, key + extension)
+
+    def write(self, path, mode, save):
+        # save: function of the open file that writes the content
+        temp = path + '.' + str(os.getpid()) + '.tmp'
+        with open(temp, mode) as file:
+            save(file)
+        os.replace(temp, path)
+
+    # File of the reward table of a todolist, see 'reward_table'
+    def table_path(self, tasks, task_names, strictness, T, detailed = True):
+        return self.path(todolist_hash(tasks, T, strictness = strictness, kind = 'reward_table', task_names = task_names, detailed = detailed), '.npy')
+
+    # Reward table, same as 'reward_table', computed and saved on the first call
+    def reward_table(self, tasks, task_names, strictness, T, detailed = True):
+        # Return: read-only memory-mapped table: pages are loaded on use and shared by all the processes reading the same file
+        path = self.table_path(tasks, task_names, strictness, T, detailed = detailed)
+        if not os.path.isfile(path):
+            table = reward_table(tasks, task_names, strictness, T, detailed = detailed)
+            self.write(path, 'wb', lambda file: np.save(file, table))
+        return np.load(path, mmap_mode = 'r')
+
+    # Best plan stored under 'key' (e.g. from 'todolist_hash'), and its rwd; (None, -inf) if none
+    def load_plan(self, key):
+        path = self.path(key, '.json')
+        if not os.path.isfile(path):
+            return None, -np.inf
+        with open(path) as file:
+            content = json.load(file)
+        return content['plan'], content['rwd']
+
+    # Store the plan under 'key' if it is better than the stored one; return True if stored
+    def save_plan(self, key, plan, rwd):
+        if self.load_plan(key)[1] >= rwd:
+            return False
+        self.write(self.path(key, '.json'), 'w', lambda file: json.dump({'rwd': float(rwd), 'plan': plan}, file, indent = 1, default = float))
+        return True
+
+    # Remove all the cached files
+    def clear(self):
+        for filename in os.listdir(self.directory):
+            if filename.endswith(('.npy', '.json', '.tmp')):
+                os.remove(os.path.join(self.directory, filename))
+
+# 'policy_traversal_all' through a 'PlanStore': the plan of the same todolist and params is loaded instead of planned again,
+# otherwise the reward table is loaded (or computed and saved) and the plan is saved for the next runs
+def policy_traversal_stored(tasks, store, T, solver = 'assignment', detailed = True, sleep_step = None, prune = True):
+    # Given: store: 'PlanStore'; other params: same as in 'policy_traversal_all'
+    # Return: plan with the max rwd, and its rwd
+    strictness = tasks['today']['strictness']
+    key = todolist_hash(tasks, T, strictness = strictness, kind = 'policy_traversal_all', solver = solver, detailed = detailed, sleep_step = sleep_step)
+    plan, rwd = store.load_plan(key)
+    if plan is not None:
+        print('Reward max: ' + str(rwd) + ' (stored plan)')
+        return plan, rwd
+
+    task_names = input_analysis(tasks)
+    rwd_table = store.reward_table(tasks, task_names, strictness, T, detailed = detailed)
+    plan, rwd = policy_traversal_all(tasks, T, rwd_table = rwd_table, solver = solver, sleep_step = sleep_step, prune = prune)
+    store.save_plan(key, plan, rwd)
+    return plan, rwd
@@ -0,0 +1,160 @@
+# (task, slot) reward tables of one todolist, many todolists, many strictness values and many days
+import numpy as np
+
+from .rewards import rwd_after_strict, reward_discrete_array
+from .cache import task_fingerprint, reward_cache, reward_discrete_cached
+from .slots import slot_ceil
+from .inputs import input_analysis
+from .registry import task_type_of
+
+# Shift of the time slots of a task type: 'n' of the reward function of time slot n is n - offset ('clock' of the type, see 'registry')
+def clock_offset(clock, curr_time, T):
+    # curr_time: 'curr_time' of task 'today', the start of the planner
+    if clock == 'since_now':
+        return slot_ceil(24 - curr_time, T)
+    return 0
+
+# Modify 'n' for different meaning of time
+def rwd_discrete_modify(n, task, strictness, T, detailed = True, curr_time = 24):
+    # curr_time: 'curr_time' of task 'today', the start of the planner
+    clock = task_type_of(task).clock
+    if clock == 'duration':
+        return reward_discrete_cached(T, task, strictness, T, detailed = detailed)
+    return reward_discrete_cached(n - clock_offset(clock, curr_time, T), task, strictness, T, detailed = detailed)
+
+# Reward row of one task: its reward in all the time slots of a day, same as 'rwd_discrete_modify' of every n
+def task_row(task, strictness, T, detailed = True, curr_time = 24):
+    n = np.arange(int(round(24 / T)))
+    clock = task_type_of(task).clock
+    if clock == 'duration':
+        return np.full(len(n), reward_discrete_cached(T, task, strictness, T, detailed = detailed))
+
+    # Rows of the same task definition are shared through 'reward_cache'
+    offset = clock_offset(clock, curr_time, T)
+    key = ('reward_table', task_fingerprint(task), float(offset), strictness, detailed, T)
+    return reward_cache.get(key, lambda: reward_discrete_array(n - offset, task, strictness, T, detailed = detailed))
+
+# Reward table of all the tasks for all the time slots of a day, evaluated in one batched call per task
+def reward_table(tasks, task_names, strictness, T, detailed = True):
+    # Given:
+    #     tasks: dictionary of all the task info
+    #     task_names: list of task names, defines the row order of the table
+    # Return: np.ndarray of shape (len(task_names), 24 / T); entry [i, n] is the reward of doing task_names[i] in [n * T, (n + 1) * T],
+    #         same as 'rwd_discrete_modify' (different meaning of 'n' for different task types)
+    table = np.zeros((len(task_names), int(round(24 / T))))
+    for i, task_name in enumerate(task_names):
+        table[i] = task_row(tasks[task_name], strictness, T, detailed = detailed, curr_time = tasks['today']['curr_time'])
+    return table
+
+# Stack tasks of the same type into one task dict of parameter arrays of shape (k, 1, 1), evaluated together by 'reward_contineous_array'
+def stack_tasks(task_list):
+    # All the tasks should have the same type and the same length of 'time' (if any)
+    stacked = {'name': task_list[0]['type'], 'type': task_list[0]['type']}
+    for key, value in task_list[0].items():
+        if key == 'time':
+            stacked[key] = [np.array([task[key][j] for task in task_list], dtype = float).reshape(-1, 1, 1) for j in range(len(value))]
+        elif key not in ['name', 'type'] and isinstance(value, (int, float)):
+            stacked[key] = np.array([task[key] for task in task_list], dtype = float).reshape(-1, 1, 1)
+    return stacked
+
+# Reward tables of a batch of todolists: rows of the same task definition, strictness and time offset are evaluated only once,
+# and all the rows of the same task type are evaluated together in one array operation
+def reward_table_batch(todolists, T, detailed = True, chunk = 1024):
+    # Given:
+    #     todolists: list of dicts of tasks, each in the same format as from 'inputYAML'
+    #     chunk: max number of rows evaluated in one array operation (bounds the memory)
+    # Return: list of reward tables, same as 'reward_table' of each todolist with rows in the order of 'input_analysis'
+    n = np.arange(int(round(24 / T)))
+    todo_keys = []
+    rows = {}           # key -> row (or value for all the time slots)
+    groups = {}         # (type, length of 'time') -> {key: (task, strictness, offset)} of the rows to evaluate
+    for tasks in todolists:
+        strictness = tasks['today']['strictness']
+        keys = []
+        for task_name in input_analysis(tasks):
+            task = tasks[task_name]
+            clock = task_type_of(task).clock
+            if clock == 'duration':
+                # Same value for all the time slots, same key as in 'task_row'
+                key = ('reward_discrete', task_fingerprint(task), float(T), strictness, detailed, T)
+                offset = None
+            else:
+                offset = float(clock_offset(clock, tasks['today']['curr_time'], T))
+                key = ('reward_table', task_fingerprint(task), offset, strictness, detailed, T)
+            keys.append(key)
+            if key in rows:
+                continue
+            if key in reward_cache.values:
+                rows[key] = np.broadcast_to(reward_cache.get(key, None), n.shape)
+            else:
+                groups.setdefault((task['type'], len(task.get('time', []))), {})[key] = (task, strictness, offset)
+        todo_keys.append(keys)
+
+    # Evaluate the missing rows group by group, and share them with later calls through 'reward_cache'
+    for group in groups.values():
+        items = list(group.items())
+        for start in range(0, len(items), chunk):
+            part = items[start:start + chunk]
+            stacked = stack_tasks([item[1][0] for item in part])
+            strictness = np.array([item[1][1] for item in part], dtype = float).reshape(-1, 1, 1)
+            if part[0][1][2] is None:
+                values = reward_discrete_array(np.full((len(part), 1), T), stacked, strictness, T, detailed = detailed)[:, 0]
+            else:
+                offsets = np.array([item[1][2] for item in part], dtype = float)
+                values = reward_discrete_array(n[None, :] - offsets[:, None], stacked, strictness, T, detailed = detailed)
+            for k, (key, _) in enumerate(part):
+                reward_cache.get(key, lambda: values[k])
+                rows[key] = np.broadcast_to(values[k], n.shape)
+
+    return [np.array([rows[key] for key in keys]).reshape(len(keys), len(n)) for keys in todo_keys]
+
+# Reward tables for a list of strictness values, blended from the tables of pure enjoyment (strictness = 0) and pure productivity (strictness = 1)
+# The reward functions are linear in 'rwd_after_strict' except for the types registered as not 'linear' (e.g. fixed-ddl tasks:
+# the decreasing speed depends on the reward), whose rows are evaluated again
+def reward_table_strictness(tasks, task_names, strictness_list, T, detailed = True):
+    # Return: list of reward tables, the same as 'reward_table' of each strictness
+    enjoyment = reward_table(tasks, task_names, 0, T, detailed = detailed)
+    productivity = reward_table(tasks, task_names, 1, T, detailed = detailed)
+    nonlinear = [i for i, task_name in enumerate(task_names) if not task_type_of(tasks[task_name]).linear]
+
+    rwd_tables = []
+    for strictness in strictness_list:
+        rwd_table = rwd_after_strict(strictness, enjoyment, productivity)
+        if nonlinear:
+            rwd_table[nonlinear] = reward_table(tasks, [task_names[i] for i in nonlinear], strictness, T, detailed = detailed)
+        rwd_tables.append(rwd_table)
+    return rwd_tables
+
+# Day of the week (1-7 for Mon.-Sun.) of the d-th planned day, the planner starts from the day after 'today'
+def weekday(tasks, d):
+    return (tasks['today']['day'] + d) % 7 + 1
+
+# Reward tables of several consecutive days, rows in the order of task_names
+# Rows that are the same every day are computed once and reused; only what changes over the days is evaluated again:
+#     tasks with clock 'since_now' (fixed-ddl and asap tasks): time since now keeps growing over the days (no mod 24), so deadlines can be days later
+#     tasks whose type has a 'day' hook: the task of each day, e.g. fixed-time tasks only on the days of the week in their 'day',
+#     long-term tasks with 'insist_day' one more every day
+def reward_table_days(tasks, task_names, days, strictness, T, detailed = True):
+    # Return: np.ndarray of shape (days, len(task_names), 24 / T)
+    n_slots = int(round(24 / T))
+    day_table = reward_table(tasks, task_names, strictness, T, detailed = detailed)
+    tables = np.repeat(day_table[None], days, axis = 0)
+    curr_time = tasks['today']['curr_time']
+
+    for i, task_name in enumerate(task_names):
+        task = tasks[task_name]
+        task_type = task_type_of(task)
+        if task_type.clock == 'since_now':
+            offset = clock_offset(task_type.clock, curr_time, T)
+            key = ('reward_table_days', task_fingerprint(task), float(offset), days, strictness, detailed, T)
+            n = np.arange(days * n_slots) - offset
+            tables[:, i] = reward_cache.get(key, lambda: reward_discrete_array(n, task, strictness, T, detailed = detailed, wrap = False)).reshape(days, n_slots)
+        elif task_type.day is not None:
+            for d in range(days):
+                task_day = task_type.day(task, weekday(tasks, d), d)
+                if task_day is None:
+                    tables[d, i] = 0
+                elif task_day is not task:
+                    tables[d, i] = task_row(task_day, strictness, T, detailed = detailed, curr_time = curr_time)
+
+    return tables
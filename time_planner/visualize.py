@@ -0,0 +1,200 @@
+# Plot of a plan: on a given matplotlib axes, to image files in parallel on the non-interactive backend, or as plain SVG/HTML
+import html
+import os
+
+import numpy as np
+
+from .slots import slot_floor
+
+# Colors of the lines, the same as the default matplotlib color cycle so that all the renderers look alike
+line_colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf']
+
+# Time slot length of a dict plan: every task other than sleeping takes exactly one time slot
+def plan_slot_length(plan):
+    lengths = [task['time'][1] - task['time'][0] for task in plan.values() if task['name'] != 'sleeping']
+    if len(lengths) == 0:
+        lengths = [(task['time'][1] - task['time'][0]) / len(task['rwd']) for task in plan.values()]
+    return min(lengths)
+
+# Lines of a plan: one line per task, made of its discrete points and joined to the first point of the next task
+# (the last task is extended by one time slot), so every task is drawn with one single line
+def plan_lines(plan, T = None):
+    # Given:
+    #     plan: dict plan, keys: task name; each task: dict with 'name', 'time' and 'rwd', in the time order
+    #     T: time slot length of the plan, default: from the plan ('plan_slot_length')
+    # Return: list of (task name, x list, y list, label x, label y) in the plan order, and the max reward
+    if len(plan) == 0:
+        raise Exception("Empty plan for visualization")
+    if T is None:
+        T = plan_slot_length(plan)
+
+    plan_tasks = list(plan.values())
+    lines = []
+    y_max = 0
+    for i in range(len(plan_tasks)):
+        time = plan_tasks[i]['time']
+        rwd = list(plan_tasks[i]['rwd'])
+
+        x = list(np.linspace(time[0], time[1], slot_floor(time[1] - time[0], T) + 1)[:-1])
+        y = rwd[:]
+        if i + 1 < len(plan_tasks):
+            x.append(plan_tasks[i + 1]['time'][0])
+            y.append(plan_tasks[i + 1]['rwd'][0])
+        else:
+            x.append(x[-1] + T)
+            y.append(y[-1])
+
+        lines.append((plan_tasks[i]['name'], x, y, (time[0] + time[1]) / 2, max(rwd) + 0.5))
+        y_max = max(y_max, max(rwd))
+
+    return lines, y_max
+
+# Visualize resulting plan for output
+# E.g.: plan={'sleeping': {'time': [0, 6], 'rwd':[1, 2, 3, 4, 5, 4]}, 'breakfast': {'time': [6, 8], 'rwd': [2, 3]}}
+def visualize_plan(plan, ax, title = 'Time Schedule Planner', T = None):
+    # plan: type: dict, keys: task name, same as input file; each task: also dict, keys: 'time', 'rwd'; 'time': list, the beginning and ending hour of the day, 'rwd': discrete current reward corresponding discrete time period
+
+    title_font = {'fontname': 'Arial', 'fontsize': 14, 'color': 'black', 'weight': 'bold', 'va': 'bottom'}
+    axis_font = {'fontname': 'Arial', 'fontsize': 12, 'color': 'black', 'weight': 'normal'}
+    text_font = {'fontname': 'Arial', 'fontsize': 12, 'weight': 'normal', 'ha': 'center', 'va': 'center'}
+
+    lines, y_max = plan_lines(plan, T)
+
+    # Iterate all the tasks in the plan
+    # Assume all the 'task's in 'plan' follows the time order for now => TODO
+    for name, x, y, label_x, label_y in lines:
+        p = ax.plot(x, y, '.-')
+        ax.text(label_x, label_y, name, color = p[0].get_color(), **text_font)
+
+    # Add axes
+    ax.set_xlim(-0.5, 24.5)
+    ax.set_ylim(0, int(y_max + 0.5) + 1)
+    ax.set_xticks(np.linspace(0, 24, 25))       # One tick every hour for any T
+    ax.set_yticks(np.linspace(0, int(y_max + 0.5) + 1, int(y_max + 0.5) + 2))
+    xlabels = [str(int(i) % 24) + ":00" for i in range(25)]
+    ax.set_xticklabels(xlabels, rotation = -45)
+
+    ax.grid(alpha = 0.5, linestyle = 'dashed', linewidth = 0.5)
+
+    # Add plot labels
+    ax.set_title(title, **title_font)
+    ax.set_xlabel('Time', **axis_font)
+    ax.set_ylabel('Reward Value', **axis_font)
+
+# Render a chunk of plans to image files with matplotlib on the non-interactive backend, one figure reused for the whole chunk
+def render_job(plans, filenames, titles, dpi = 100, T = None):
+    # Figure without pyplot: no GUI backend, no global figure manager, safe in worker processes
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(figsize = (8, 4.5))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    fig.subplots_adjust(left = 0.08, right = 0.98, bottom = 0.17, top = 0.92)     # Fixed margins: 'tight_layout' would draw every figure twice
+    for plan, filename, title in zip(plans, filenames, titles):
+        ax.clear()
+        visualize_plan(plan, ax, title, T)
+        fig.savefig(filename, dpi = dpi)        # Format from the file extension: '.png', '.svg', '.pdf'
+    return len(plans)
+
+# Render many plans to image files in parallel worker processes, headless (no plt.show, no pyplot figures)
+def render_plans(plans, directory = 'plans', fmt = 'png', titles = None, workers = None, dpi = 100, T = None):
+    # Given:
+    #     plans: list of dict plans
+    #     directory: output directory, created if needed; files are named 'plan_<k>.<fmt>'
+    #     fmt: 'png', 'svg' or 'pdf' for matplotlib, or 'svg_lite' for the dependency-free renderer 'plan_svg' (no worker processes needed)
+    #     titles: list of titles, default: 'Plan <k>'
+    #     workers: number of worker processes, default: number of CPUs
+    # Return: list of the file names, in the order of 'plans'
+    if titles is None:
+        titles = ['Plan ' + str(k) for k in range(len(plans))]
+    if len(titles) != len(plans):
+        raise Exception("Number of titles does not match number of plans")
+    os.makedirs(directory, exist_ok = True)
+
+    if fmt == 'svg_lite':
+        filenames = [os.path.join(directory, 'plan_' + str(k) + '.svg') for k in range(len(plans))]
+        for plan, filename, title in zip(plans, filenames, titles):
+            with open(filename, 'w') as file:
+                file.write(plan_svg(plan, title, T = T))
+        return filenames
+
+    if fmt not in ['png', 'svg', 'pdf']:
+        raise Exception("Unknown rendering format: " + str(fmt))
+    filenames = [os.path.join(directory, 'plan_' + str(k) + '.' + fmt) for k in range(len(plans))]
+
+    # One chunk of plans per worker, so every worker sets up matplotlib and its figure only once
+    if workers is None:
+        workers = os.cpu_count() or 1
+    n_chunks = max(1, min(workers, len(plans)))
+    chunks = [range(k, len(plans), n_chunks) for k in range(n_chunks)]
+
+    from concurrent.futures import ProcessPoolExecutor      # Imported on first use, as in the parallel traversal
+    with ProcessPoolExecutor(max_workers = n_chunks) as executor:
+        jobs = [executor.submit(render_job, [plans[k] for k in chunk], [filenames[k] for k in chunk], [titles[k] for k in chunk], dpi, T) \
+                for chunk in chunks]
+        for job in jobs:
+            job.result()        # Raise the errors of the workers
+    return filenames
+
+# Dependency-free SVG timeline of a plan, the same layout as 'visualize_plan', as a string
+def plan_svg(plan, title = 'Time Schedule Planner', width = 800, height = 400, T = None):
+    # Return: SVG string, can be saved as a '.svg' file or embedded in HTML
+    lines, y_max = plan_lines(plan, T)
+    y_top = int(y_max + 0.5) + 1
+
+    # Margins of the plot area: left, right, top, bottom
+    left, right, top, bottom = 50, 15, 35, 45
+    x_scale = (width - left - right) / 25.0        # x range: [-0.5, 24.5]
+    y_scale = (height - top - bottom) / float(y_top)
+
+    def px(x):
+        return left + (x + 0.5) * x_scale
+
+    def py(y):
+        return height - bottom - y * y_scale
+
+    svg = ['<svg xmlns="http://www.w3.org/2000/svg" width="%d" height="%d" viewBox="0 0 %d %d" font-family="Arial, sans-serif">' % (width, height, width, height),
+           '<rect width="100%" height="100%" fill="white"/>',
+           '<text x="%.1f" y="22" font-size="14" font-weight="bold" text-anchor="middle">%s</text>' % (width / 2, html.escape(str(title)))]
+
+    # Grid and ticks: one every hour, one every reward unit
+    grid = []
+    for hour in range(25):
+        grid.append('M%.1f %.1fV%.1f' % (px(hour), py(0), py(y_top)))
+        svg.append('<text x="%.1f" y="%.1f" font-size="9" text-anchor="middle">%d:00</text>' % (px(hour), py(0) + 14, hour % 24))
+    for value in range(y_top + 1):
+        grid.append('M%.1f %.1fH%.1f' % (px(-0.5), py(value), px(24.5)))
+        svg.append('<text x="%.1f" y="%.1f" font-size="9" text-anchor="end">%d</text>' % (left - 4, py(value) + 3, value))
+    svg.append('<path d="%s" stroke="#b0b0b0" stroke-width="0.5" stroke-dasharray="3,3" fill="none"/>' % ''.join(grid))
+    svg.append('<rect x="%.1f" y="%d" width="%.1f" height="%.1f" stroke="black" fill="none"/>' % (left, top, width - left - right, height - top - bottom))
+    svg.append('<text x="%.1f" y="%d" font-size="12" text-anchor="middle">Time</text>' % (left + (width - left - right) / 2, height - 5))
+    svg.append('<text x="12" y="%.1f" font-size="12" text-anchor="middle" transform="rotate(-90 12 %.1f)">Reward Value</text>' \
+               % (top + (height - top - bottom) / 2, top + (height - top - bottom) / 2))
+
+    # One polyline and one label per task
+    for k in range(len(lines)):
+        name, x, y, label_x, label_y = lines[k]
+        color = line_colors[k % len(line_colors)]
+        points = ' '.join(['%.1f,%.1f' % (px(x[i]), py(y[i])) for i in range(len(x))])
+        svg.append('<polyline points="%s" stroke="%s" stroke-width="1.5" fill="none"/>' % (points, color))
+        svg.append('<text x="%.1f" y="%.1f" font-size="12" fill="%s" text-anchor="middle">%s</text>' % (px(label_x), py(label_y) + 4, color, html.escape(str(name))))
+
+    svg.append('</svg>')
+    return '\n'.join(svg)
+
+# Dependency-free HTML page of many plans, one inline SVG timeline each
+def plans_html(plans, titles = None, filename = None, T = None):
+    # Return: HTML string, also saved to 'filename' if given
+    if titles is None:
+        titles = ['Plan ' + str(k) for k in range(len(plans))]
+    page = ['<!DOCTYPE html>', '<html><head><meta charset="utf-8"><title>Time Schedule Planner</title></head><body>']
+    for plan, title in zip(plans, titles):
+        page.append('<div>' + plan_svg(plan, title, T = T) + '</div>')
+    page.append('</body></html>')
+    page = '\n'.join(page)
+
+    if filename is not None:
+        with open(filename, 'w') as file:
+            file.write(page)
+    return page